@@ -0,0 +1,373 @@
+"""
+Benchmark suite
+---------------
+Times the hot paths of the assignments and compares them with a stored
+baseline, so a speed-up (or slow-down) can be shown with numbers.
+
+Benchmarks:
+  pcr.calculate          day03 calculate_extension_time (1000 calls)
+  diopt.parse            day04 _parse_table on every fixture in fixtures/
+  recipes.load           day08 graphs.load_dataset on a generated CSV
+  recipes.clean          day08 graphs.clean_data
+  recipes.categorize     day08 graphs.categorize
+  figures.pie            day08 draw_pie + savefig (PNG into memory)
+  figures.boxplot        day08 draw_boxplot + savefig (PNG into memory)
+
+Benchmarks whose libraries are not installed are reported as skipped.
+The recipe CSV is generated (fixed random seed), so no Kaggle account is
+needed; its size is set with --recipes.
+
+Baselines are per machine and are not committed, so the first step on a
+new machine is always `run --save`.
+
+Usage (from the repository root):
+    python benchmarks/bench.py run --save            # store baseline for this machine (do this first)
+    python benchmarks/bench.py compare               # run again, flag regressions
+    python benchmarks/bench.py compare old.json new.json --threshold 0.2
+    python benchmarks/bench.py record                # download real DIOPT fixtures
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import warnings
+from importlib.util import module_from_spec, spec_from_file_location
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HERE = os.path.join(ROOT, "benchmarks")
+FIXTURES = os.path.join(HERE, "fixtures")
+BASELINES = os.path.join(HERE, "baselines")
+
+for day in ("day04", "day08"):
+    sys.path.insert(0, os.path.join(ROOT, day))
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a setup function; it returns the callable to be timed."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _quiet(fn):
+    """Wrap fn so its print() output and warnings are discarded."""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return fn()
+    return run
+
+
+# =========================
+# Benchmarks
+# =========================
+@benchmark("pcr.calculate")
+def _pcr(ctx):
+    path = os.path.join(ROOT, "day03", "PCR extension time calculator_cmdline_copy.py")
+    spec = spec_from_file_location("pcr_cmdline_copy", path)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    def run():
+        for length in range(1000):
+            module.calculate_extension_time(1000.0, 50.0 * length)
+    return _quiet(run)
+
+
+@benchmark("diopt.parse")
+def _diopt(ctx):
+    from ortholog_fetcher import _parse_table
+
+    pages = []
+    for name in sorted(os.listdir(FIXTURES)):
+        if name.startswith("diopt_") and name.endswith(".html"):
+            with open(os.path.join(FIXTURES, name), encoding="utf-8") as fh:
+                pages.append(fh.read())
+    if not pages:
+        raise ImportError("no DIOPT fixtures found")
+
+    def run():
+        for page in pages:
+            _parse_table(page)
+    return run
+
+
+def make_recipe_csv(path, n_recipes, n_tags=300, seed=0):
+    """Write a CSV shaped like the Epicurious dump (0/1 tags + nutrition)."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    data = {
+        "title": [f"recipe {i}" for i in range(n_recipes)],
+        "rating": rng.choice([0, 1.25, 2.5, 3.75, 4.375, 5], n_recipes),
+        "calories": rng.gamma(2, 200, n_recipes),
+        "protein": rng.gamma(2, 10, n_recipes),
+        "fat": rng.gamma(2, 12, n_recipes),
+        "sodium": rng.gamma(2, 300, n_recipes),
+    }
+    for col in ("calories", "protein", "fat", "sodium"):
+        data[col][rng.random(n_recipes) < 0.2] = np.nan
+    for col, share in (("vegan", 0.05), ("vegetarian", 0.3), ("fish", 0.1)):
+        data[col] = (rng.random(n_recipes) < share).astype(float)
+    rates = rng.uniform(0.001, 0.1, n_tags)
+    tags = rng.random((n_recipes, n_tags)) < rates
+    frame = pd.concat([pd.DataFrame(data),
+                       pd.DataFrame(tags.astype(float), columns=[f"tag {i}" for i in range(n_tags)])],
+                      axis=1)
+    frame.to_csv(path, index=False)
+    return path
+
+
+def _recipes(ctx):
+    """Path of the generated recipe CSV (written once per run)."""
+    if "csv" not in ctx:
+        ctx["csv"] = make_recipe_csv(os.path.join(ctx["tmp"], "recipes.csv"), ctx["recipes"])
+    return ctx["csv"]
+
+
+@benchmark("recipes.load")
+def _load(ctx):
+    import graphs
+    from stage_profiler import StageProfiler
+
+    csv = _recipes(ctx)
+    return _quiet(lambda: graphs.load_dataset(StageProfiler(enabled=False), csv))
+
+
+@benchmark("recipes.clean")
+def _clean(ctx):
+    import graphs
+    from stage_profiler import StageProfiler
+
+    prof = StageProfiler(enabled=False)
+    df = _quiet(lambda: graphs.load_dataset(prof, _recipes(ctx)))()
+    return _quiet(lambda: graphs.clean_data(df, prof))
+
+
+@benchmark("recipes.categorize")
+def _categorize(ctx):
+    import graphs
+    from stage_profiler import StageProfiler
+
+    prof = StageProfiler(enabled=False)
+    df = _quiet(lambda: graphs.load_dataset(prof, _recipes(ctx)))()
+    df, _ = _quiet(lambda: graphs.clean_data(df, prof))()
+    return _quiet(lambda: graphs.categorize(df, prof))
+
+
+def _figure(ctx, draw, columns, spec):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import graphs
+    from stage_profiler import StageProfiler
+
+    prof = StageProfiler(enabled=False)
+    df = _quiet(lambda: graphs.load_dataset(prof, _recipes(ctx)))()
+    df, _ = _quiet(lambda: graphs.clean_data(df, prof))()
+    data = _quiet(lambda: graphs.categorize(df, prof))()[columns]
+
+    def run():
+        draw(data, spec)
+        plt.savefig(io.BytesIO(), format="png", dpi=150, bbox_inches='tight')
+        plt.close()
+    return run
+
+
+@benchmark("figures.pie")
+def _pie(ctx):
+    import graphs
+    return _figure(ctx, graphs.draw_pie, ["category"],
+                   {**graphs.PIE_STYLE, "title": "Recipe Category Distribution"})
+
+
+@benchmark("figures.boxplot")
+def _boxplot(ctx):
+    import graphs
+    return _figure(ctx, graphs.draw_boxplot, ["category", "protein"],
+                   {**graphs.BOXPLOT_STYLE, "column": "protein", "order": graphs.categories,
+                    "title": "Protein Content by Recipe Category", "ylabel": "Protein (g)"})
+
+
+# =========================
+# Running & Comparing
+# =========================
+def time_callable(fn, repeat=5):
+    """Seconds per call: timeit autorange, then `repeat` samples."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    samples = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run_suite(names=None, repeat=5, recipes=5000):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        ctx = {"tmp": tmp, "recipes": recipes}
+        for name, setup in BENCHMARKS.items():
+            if names and not any(name.startswith(n) for n in names):
+                continue
+            try:
+                fn = setup(ctx)
+            except ImportError as exc:
+                results[name] = {"skipped": str(exc)}
+                print(f"{name:22s} skipped ({exc})")
+                continue
+            results[name] = time_callable(fn, repeat)
+            print(f"{name:22s} {results[name]['median'] * 1000:10.3f} ms")
+    return {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": {
+            "node": platform.node(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+        },
+        "settings": {"repeat": repeat, "recipes": recipes},
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=0.20, stat="min"):
+    """Rows of (name, old, new, change, status); status is ok/REGRESSION/faster/skipped.
+
+    Uses the fastest sample by default: it is the least affected by other
+    programs running at the same time.
+    """
+    rows = []
+    for name in sorted(set(baseline["results"]) | set(current["results"])):
+        old = baseline["results"].get(name, {})
+        new = current["results"].get(name, {})
+        if stat not in old or stat not in new:
+            rows.append((name, old.get(stat), new.get(stat), None, "skipped"))
+            continue
+        change = new[stat] / old[stat] - 1
+        if change > threshold:
+            status = "REGRESSION"
+        elif change < -threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, old[stat], new[stat], change, status))
+    return rows
+
+
+def default_baseline():
+    return os.path.join(BASELINES, f"{platform.node() or 'baseline'}.json")
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_report(report, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Saved {path}")
+
+
+def record_fixtures(genes, organism):
+    """Download real DIOPT result pages into fixtures/ (needs network)."""
+    import requests
+    from ortholog_fetcher import DIOPT_URL, SPECIES2TAX, _diopt_params
+
+    for gene in genes:
+        resp = requests.get(DIOPT_URL, params=_diopt_params(gene, SPECIES2TAX[organism]), timeout=30)
+        resp.raise_for_status()
+        path = os.path.join(FIXTURES, f"diopt_{gene}_{organism.replace(' ', '_')}.html")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(resp.text)
+        print(f"Saved {path} ({len(resp.content)} bytes)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark suite with stored baselines")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Run the benchmarks")
+    p_run.add_argument("--save", nargs="?", const=default_baseline(), metavar="FILE",
+                       help="Store results as JSON (default: baselines/<machine>.json)")
+
+    p_cmp = sub.add_parser("compare", help="Compare results against a baseline")
+    p_cmp.add_argument("baseline", nargs="?", default=default_baseline())
+    p_cmp.add_argument("current", nargs="?", help="Results JSON (default: run the suite now)")
+    p_cmp.add_argument("--threshold", type=float, default=0.20,
+                       help="Allowed slow-down before flagging, as a fraction (default 0.20)")
+    p_cmp.add_argument("--stat", choices=["min", "median"], default="min",
+                       help="Which timing to compare (default: min)")
+    p_cmp.add_argument("--save", metavar="FILE", help="Also store the new results")
+
+    for p in (p_run, p_cmp):
+        p.add_argument("--only", nargs="*", metavar="PREFIX", help="Only benchmarks starting with these")
+        p.add_argument("--repeat", type=int, default=5)
+        p.add_argument("--recipes", type=int, default=5000, help="Rows in the generated recipe CSV")
+
+    p_rec = sub.add_parser("record", help="Download DIOPT pages as parsing fixtures")
+    p_rec.add_argument("genes", nargs="*", default=["FBgn0000099", "FBgn0003996"])
+    p_rec.add_argument("--organism", default="human")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        record_fixtures(args.genes, args.organism)
+        return 0
+
+    if args.command == "run":
+        report = run_suite(args.only, args.repeat, args.recipes)
+        if args.save:
+            save_report(report, args.save)
+        return 0
+
+    try:
+        baseline = load_report(args.baseline)
+    except (OSError, ValueError) as exc:
+        parser.error(f"cannot read baseline {args.baseline} ({exc}); "
+                     f"store one first with: python benchmarks/bench.py run --save")
+    if args.current:
+        try:
+            current = load_report(args.current)
+        except (OSError, ValueError) as exc:
+            parser.error(f"cannot read results {args.current} ({exc})")
+    else:
+        settings = baseline.get("settings", {})
+        current = run_suite(args.only, args.repeat, settings.get("recipes", args.recipes))
+    if args.save:
+        save_report(current, args.save)
+
+    rows = compare(baseline, current, args.threshold, args.stat)
+    print(f"\n{'benchmark':22s} {'baseline ms':>12s} {'current ms':>12s} {'change':>8s}")
+    for name, old, new, change, status in rows:
+        old_s = f"{old * 1000:12.3f}" if old is not None else f"{'-':>12s}"
+        new_s = f"{new * 1000:12.3f}" if new is not None else f"{'-':>12s}"
+        change_s = f"{change:+8.1%}" if change is not None else f"{'':8s}"
+        print(f"{name:22s} {old_s} {new_s} {change_s}  {status}")
+
+    regressions = [r[0] for r in rows if r[4] == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\nNo regressions over {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Cold-start benchmark
+--------------------
+Runs each command-line tool in a fresh interpreter (`--help`, plus the
+simple PCR calculators doing a real calculation) and checks that its
+startup stays within a time budget.
+
+The budget is for the time *on top of* a bare `python -c pass`, so it
+measures what our imports cost rather than how fast the machine starts
+Python.  Each command runs several times and the median is used.
+
+Usage (from the repository root):
+    python benchmarks/startup.py            # exit code 1 if over budget
+    python benchmarks/startup.py --runs 10 --scale 2
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, script relative to ROOT, arguments, budget in seconds above bare python)
+COMMANDS = [
+    ("pcr cmdline --help", "day02/PCR extension time calculator_cmdline.py", ["--help"], 0.05),
+    ("pcr cmdline 1000 2000", "day02/PCR extension time calculator_cmdline.py", ["1000", "2000"], 0.05),
+    ("pcr cmdline copy 1000 2000", "day03/PCR extension time calculator_cmdline_copy.py", ["1000", "2000"], 0.05),
+    ("geometry --help", "day02/geometry.py", ["--help"], 0.05),
+    ("ortholog_fetcher --help", "day04/ortholog_fetcher.py", ["--help"], 0.10),
+    ("graphs --help", "day08/graphs.py", ["--help"], 0.10),
+    ("tag_stats --help", "day08/tag_stats.py", ["--help"], 0.10),
+    ("recipe_sketches --help", "day08/recipe_sketches.py", ["--help"], 0.10),
+    ("recipe_search --help", "day08/recipe_search.py", ["--help"], 0.10),
+]
+
+
+def time_command(argv, runs):
+    """Median wall time of `runs` fresh runs of argv (output discarded)."""
+    subprocess.run(argv, cwd=ROOT, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL, check=True)  # warm-up (disk cache)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=ROOT, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def run(runs=5, scale=1.0, python=sys.executable):
+    """Time every command; returns a list of result dicts."""
+    baseline = time_command([python, "-c", "pass"], runs)
+    results = []
+    for name, script, args, budget in COMMANDS:
+        total = time_command([python, os.path.join(ROOT, script), *args], runs)
+        overhead = max(0.0, total - baseline)
+        results.append({
+            "name": name,
+            "seconds": total,
+            "overhead": overhead,
+            "budget": budget * scale,
+            "ok": overhead <= budget * scale,
+        })
+    return baseline, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check cold-start time of every tool")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per command (median is used)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiply every budget, e.g. 2 on a slow machine")
+    args = parser.parse_args(argv)
+
+    baseline, results = run(args.runs, args.scale)
+    print(f"bare python startup: {baseline * 1000:.1f} ms")
+    print(f"{'command':30s} {'total ms':>9s} {'extra ms':>9s} {'budget':>7s}")
+    for r in results:
+        flag = "" if r["ok"] else "  OVER BUDGET"
+        print(f"{r['name']:30s} {r['seconds'] * 1000:9.1f} {r['overhead'] * 1000:9.1f} "
+              f"{r['budget'] * 1000:7.0f}{flag}")
+
+    failed = [r["name"] for r in results if not r["ok"]]
+    if failed:
+        print(f"\n{len(failed)} command(s) over budget: {', '.join(failed)}")
+        return 1
+    print("\nAll commands within budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+# Tests for the baseline comparison in benchmarks/bench.py
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import bench
+
+
+def _report(**timings):
+    return {"results": {name: ({"min": t, "median": t} if t is not None else {"skipped": "missing"})
+                        for name, t in timings.items()}}
+
+
+def test_compare_flags_slowdown_over_threshold():
+    rows = bench.compare(_report(a=1.0, b=1.0), _report(a=1.5, b=1.1), threshold=0.2)
+    status = {name: s for name, _, _, _, s in rows}
+    assert status == {"a": "REGRESSION", "b": "ok"}
+
+
+def test_compare_reports_speedups_and_skipped():
+    rows = bench.compare(_report(a=1.0, b=1.0), _report(a=0.5, b=None), threshold=0.2)
+    status = {name: s for name, _, _, _, s in rows}
+    assert status == {"a": "faster", "b": "skipped"}
+
+
+def test_pcr_benchmark_runs(capsys):
+    fn = bench.BENCHMARKS["pcr.calculate"]({})
+    fn()
+    assert capsys.readouterr().out == ""
+
+
+def test_compare_without_baseline_is_a_usage_error(tmp_path, capsys):
+    missing = str(tmp_path / "nope.json")
+    with pytest.raises(SystemExit) as exc:
+        bench.main(["compare", missing])
+    assert exc.value.code == 2
+    assert "run --save" in capsys.readouterr().err
@@ -1,13 +1,12 @@
-# Import math module for pi
-import math
+# The calculation lives in geometry.py (it also handles whole files of radii);
+# this is just a small window in front of it.
 from tkinter import *
 
-# Create the root window
-root = Tk()
-root.title("Circle Area Calculator")
+from geometry import circle_area
+
 
 # Create a function to calculate the area
-def calculate_area():
+def calculate_area(radius_entry, result_label):
     try:
         radius = float(radius_entry.get())
     except ValueError:
@@ -16,23 +15,33 @@ def calculate_area():
         result_label.config(text=msg)
         return
     # Calculate the area
-    area = math.pi * radius ** 2
+    area = circle_area(radius)
     # Update the result label with the area, rounded to 2 decimal places
     result_label.config(text=f"Area: {area:.2f}")
 
-# Create a label and entry for the radius
-radius_label = Label(root, text="Enter the radius of the circle:")
-radius_label.pack()
-radius_entry = Entry(root)
-radius_entry.pack()
 
-# Create a button to calculate the area
-calculate_button = Button(root, text="Calculate Area", command=calculate_area)
-calculate_button.pack()
+def main():
+    # Create the root window
+    root = Tk()
+    root.title("Circle Area Calculator")
+
+    # Create a label and entry for the radius
+    radius_label = Label(root, text="Enter the radius of the circle:")
+    radius_label.pack()
+    radius_entry = Entry(root)
+    radius_entry.pack()
+
+    # Create a label to display the result
+    result_label = Label(root, text="Area:")
+
+    # Create a button to calculate the area
+    calculate_button = Button(root, text="Calculate Area",
+                              command=lambda: calculate_area(radius_entry, result_label))
+    calculate_button.pack()
+    result_label.pack()
+
+    root.mainloop()
 
-# Create a label to display the result
-result_label = Label(root, text="Area:")
-result_label.pack()
 
 if __name__ == "__main__":
-    root.mainloop()
\ No newline at end of file
+    main()
@@ -0,0 +1,206 @@
+"""
+Geometry engine
+---------------
+The calculations behind area.py, written for NumPy arrays so the same code
+handles one radius typed into the GUI or millions of radii from a file.
+
+Shapes and measures (r = radius, h = height):
+    circle    area = pi r^2            perimeter = 2 pi r
+    sphere    volume = 4/3 pi r^3      surface = 4 pi r^2
+    cylinder  volume = pi r^2 h        surface = 2 pi r (r + h)
+
+Files are processed in chunks, so memory use does not depend on file size:
+    .npy          NumPy array, opened memory-mapped
+    .csv / .txt   one radius per line (or pick a column with --column)
+    anything else raw float64 binary, opened memory-mapped
+
+NumPy is imported inside the array and file functions, so a single radius
+(the GUI) needs only the standard library.
+
+Command line:
+    python geometry.py radii.npy areas.npy
+    python geometry.py radii.csv volumes.csv --shape sphere --measure volume
+"""
+
+import argparse
+import itertools
+import math
+import os
+import tempfile
+import warnings
+
+DEFAULT_CHUNK = 1_000_000   # radii per chunk (8 MB of float64)
+
+FORMULAS = {
+    "circle": {
+        "area": lambda r, h: math.pi * r ** 2,
+        "perimeter": lambda r, h: 2 * math.pi * r,
+    },
+    "sphere": {
+        "volume": lambda r, h: 4 / 3 * math.pi * r ** 3,
+        "surface": lambda r, h: 4 * math.pi * r ** 2,
+    },
+    "cylinder": {
+        "volume": lambda r, h: math.pi * r ** 2 * h,
+        "surface": lambda r, h: 2 * math.pi * r * (r + h),
+    },
+}
+
+
+# =========================
+# Array calculations
+# =========================
+def compute(radii, shape="circle", measure="area", height=1.0):
+    """Apply one formula to a number (returns a float) or an array of radii."""
+    try:
+        formula = FORMULAS[shape][measure]
+    except KeyError:
+        raise ValueError(f"Unknown shape/measure: {shape}/{measure}") from None
+    if isinstance(radii, (int, float)):
+        return float(formula(float(radii), height))
+
+    import numpy as np
+    return formula(np.asarray(radii, dtype=np.float64), height)
+
+
+def circle_area(radius):
+    """Area of a circle; returns a float for a single radius."""
+    return compute(radius, "circle", "area")
+
+
+# =========================
+# File input / output
+# =========================
+def _is_text(path):
+    return os.path.splitext(path)[1].lower() in (".csv", ".txt")
+
+
+def open_radii(path):
+    """Memory-mapped array for .npy and raw binary files (not for text files)."""
+    import numpy as np
+
+    if path.lower().endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    return np.memmap(path, dtype=np.float64, mode="r")
+
+
+def iter_radii(path, chunk_size=DEFAULT_CHUNK, column=0, skiprows=0):
+    """Yield the radii in `path` as float64 arrays of at most chunk_size."""
+    import numpy as np
+
+    if not _is_text(path):
+        radii = open_radii(path)
+        for start in range(0, len(radii), chunk_size):
+            yield np.asarray(radii[start:start + chunk_size], dtype=np.float64)
+        return
+
+    with open(path, encoding="utf-8") as fh:
+        lines = itertools.islice(fh, skiprows, None)
+        while True:
+            block = list(itertools.islice(lines, chunk_size))
+            if not block:
+                break
+            with warnings.catch_warnings():
+                # a chunk of only blank or # comment lines is fine, just empty
+                warnings.filterwarnings("ignore", "loadtxt: input contained no data")
+                radii = np.loadtxt(block, delimiter=",", usecols=column, dtype=np.float64, ndmin=1)
+            yield radii
+
+
+def _write_npy(chunks, out_path, shape, measure, height):
+    """Write results of all chunks to a .npy file; returns the count.
+
+    The number of radii in a text file is only known after reading it (blank
+    and # comment lines are skipped), so the results go to a temporary raw
+    file first and are copied into the .npy once its size is known.
+    """
+    import numpy as np
+
+    folder = os.path.dirname(os.path.abspath(out_path))
+    fd, tmp_path = tempfile.mkstemp(suffix=".bin", dir=folder)
+    try:
+        written = 0
+        with os.fdopen(fd, "wb") as fh:
+            for radii in chunks:
+                compute(radii, shape, measure, height).tofile(fh)
+                written += len(radii)
+
+        out = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.float64, shape=(written,))
+        if written:
+            tmp = np.memmap(tmp_path, dtype=np.float64, mode="r")
+            for start in range(0, written, DEFAULT_CHUNK):
+                out[start:start + DEFAULT_CHUNK] = tmp[start:start + DEFAULT_CHUNK]
+            del tmp
+        out.flush()
+        del out
+    finally:
+        os.remove(tmp_path)
+    return written
+
+
+def compute_file(in_path, out_path, shape="circle", measure="area", height=1.0,
+                 chunk_size=DEFAULT_CHUNK, column=0, skiprows=0):
+    """Stream radii from in_path, write the results to out_path; returns the count.
+
+    The output format follows out_path's extension like the input does
+    (.npy, .csv/.txt, otherwise raw float64).
+    """
+    chunks = iter_radii(in_path, chunk_size, column, skiprows)
+
+    if out_path.lower().endswith(".npy"):
+        if _is_text(in_path):
+            return _write_npy(chunks, out_path, shape, measure, height)
+
+        import numpy as np
+        size = len(open_radii(in_path))
+        out = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.float64, shape=(size,))
+        written = 0
+        for radii in chunks:
+            out[written:written + len(radii)] = compute(radii, shape, measure, height)
+            written += len(radii)
+        out.flush()
+        del out
+        if written != size:
+            raise RuntimeError(f"Read {written} radii from {in_path}, expected {size}")
+        return written
+
+    import numpy as np
+    text = _is_text(out_path)
+    written = 0
+    with open(out_path, "w" if text else "wb") as fh:
+        for radii in chunks:
+            result = compute(radii, shape, measure, height)
+            if text:
+                np.savetxt(fh, result, fmt="%.10g")
+            else:
+                result.tofile(fh)
+            written += len(radii)
+    return written
+
+
+# =========================
+# Command line
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Areas, perimeters and volumes for files of radii")
+    parser.add_argument("input", help="Radii: .npy, .csv/.txt, or raw float64 binary")
+    parser.add_argument("output", help="Results file (format chosen by extension)")
+    parser.add_argument("--shape", choices=sorted(FORMULAS), default="circle")
+    parser.add_argument("--measure", default="area",
+                        help="area/perimeter (circle), volume/surface (sphere, cylinder)")
+    parser.add_argument("--height", type=float, default=1.0, help="Cylinder height")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK)
+    parser.add_argument("--column", type=int, default=0, help="Column of a CSV input")
+    parser.add_argument("--skiprows", type=int, default=0, help="Header lines in a CSV input")
+    args = parser.parse_args(argv)
+
+    if args.measure not in FORMULAS[args.shape]:
+        parser.error(f"{args.shape} supports: {', '.join(FORMULAS[args.shape])}")
+
+    count = compute_file(args.input, args.output, args.shape, args.measure, args.height,
+                         args.chunk_size, args.column, args.skiprows)
+    print(f"Wrote {count} {args.shape} {args.measure} values to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
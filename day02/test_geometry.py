@@ -0,0 +1,64 @@
+# Tests for geometry.py (the engine behind area.py)
+from pathlib import Path
+import math
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import geometry
+
+
+RADII = np.array([0.5, 1.0, 2.0, 3.25, 10.0])
+
+
+def test_single_radius_is_a_plain_float():
+    area = geometry.circle_area(2)
+    assert type(area) is float
+    assert area == pytest.approx(math.pi * 4)
+
+
+def test_arrays_match_the_formulas():
+    assert np.allclose(geometry.compute(RADII), math.pi * RADII ** 2)
+    assert np.allclose(geometry.compute(RADII, "sphere", "volume"), 4 / 3 * math.pi * RADII ** 3)
+    assert np.allclose(geometry.compute(RADII, "cylinder", "surface", height=2.0),
+                       2 * math.pi * RADII * (RADII + 2.0))
+    with pytest.raises(ValueError):
+        geometry.compute(RADII, "circle", "volume")
+
+
+def test_csv_to_npy_skips_comments_and_blank_lines(tmp_path):
+    src = tmp_path / "radii.csv"
+    src.write_text("\n# radii\n" + "\n".join(str(r) for r in RADII[:3]) + "\n\n"
+                   + "\n".join(str(r) for r in RADII[3:]) + "\n")
+    out = tmp_path / "areas.npy"
+
+    assert geometry.compute_file(str(src), str(out), chunk_size=2) == len(RADII)
+    assert np.allclose(np.load(out), math.pi * RADII ** 2)
+
+    # a header row skipped with skiprows after a blank first line
+    src.write_text("\nradius\n" + "\n".join(str(r) for r in RADII) + "\n")
+    assert geometry.compute_file(str(src), str(out), skiprows=2) == len(RADII)
+    assert np.allclose(np.load(out), math.pi * RADII ** 2)
+
+
+def test_csv_to_csv_with_column(tmp_path):
+    src = tmp_path / "shapes.csv"
+    src.write_text("name,radius\n" + "\n".join(f"s{i},{r}" for i, r in enumerate(RADII)) + "\n")
+    out = tmp_path / "perimeters.csv"
+
+    count = geometry.compute_file(str(src), str(out), "circle", "perimeter",
+                                  column=1, skiprows=1, chunk_size=3)
+    assert count == len(RADII)
+    assert np.allclose(np.loadtxt(out), 2 * math.pi * RADII)
+
+
+def test_raw_binary_to_npy(tmp_path):
+    radii = np.random.default_rng(0).random(10_001) * 5
+    src = tmp_path / "radii.bin"
+    radii.tofile(src)
+    out = tmp_path / "volumes.npy"
+
+    assert geometry.compute_file(str(src), str(out), "sphere", "volume", chunk_size=4096) == len(radii)
+    assert np.allclose(np.load(out), 4 / 3 * math.pi * radii ** 3)
@@ -0,0 +1,171 @@
+"""
+Instrumentation module
+----------------------
+Optional per-gene metrics for ortholog_fetcher.fetch_and_save():
+stage timings (download, parse, unescape, write), bytes downloaded,
+rows parsed and download retries.
+
+Usage:
+    metrics = FetchMetrics()
+    for gene in genes:
+        fetch_and_save(gene, "human", out_dir, metrics=metrics)
+    metrics.write_jsonl("metrics.jsonl")      # one JSON object per gene
+    print(metrics.prometheus())              # text dump with percentiles
+
+Only the standard library is used, so importing this costs nothing.
+"""
+
+from __future__ import annotations
+import json, math, time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+STAGES = ("download", "parse", "unescape", "write")
+PERCENTILES = (50, 90, 99)
+
+# ---------------------------------------------------------------------------
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list (None if empty)."""
+    if not values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+class GeneRecord:
+    """Metrics collected while fetching one gene."""
+
+    def __init__(self, fbgn: str, organism: str):
+        self.fbgn = fbgn
+        self.organism = organism
+        self.timings: Dict[str, float] = {}
+        self.bytes_downloaded = 0
+        self.rows_parsed = 0
+        self.retries = 0
+        self.error: Optional[str] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block; repeated stages add up."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+    @property
+    def total(self) -> float:
+        return sum(self.timings.values())
+
+    def as_dict(self) -> dict:
+        return {
+            "fbgn": self.fbgn,
+            "organism": self.organism,
+            "timings": {k: round(v, 6) for k, v in self.timings.items()},
+            "total": round(self.total, 6),
+            "bytes_downloaded": self.bytes_downloaded,
+            "rows_parsed": self.rows_parsed,
+            "retries": self.retries,
+            "error": self.error,
+        }
+
+
+class _NullRecord(GeneRecord):
+    """Stand-in used when no metrics were requested: records nothing.
+
+    One instance is shared by every uninstrumented fetch, so writes to its
+    counters and error are ignored and it always stays empty.
+    """
+
+    def __init__(self):
+        for name, value in vars(GeneRecord("", "")).items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        pass
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        yield
+
+
+NULL_RECORD = _NullRecord()
+
+# ---------------------------------------------------------------------------
+
+class FetchMetrics:
+    """Collects one GeneRecord per fetch and summarises the whole batch."""
+
+    def __init__(self):
+        self.records: List[GeneRecord] = []
+
+    def start(self, fbgn: str, organism: str) -> GeneRecord:
+        rec = GeneRecord(fbgn, organism)
+        self.records.append(rec)
+        return rec
+
+    # ---------- summaries ----------
+    def summary(self) -> Dict[str, dict]:
+        """Per-stage count/sum/percentiles over the successful fetches (seconds).
+
+        Failed genes are left out (they are counted in totals()["errors"]), so a
+        gene rejected before the download doesn't show up as a 0-second fetch.
+        """
+        ok = [r for r in self.records if not r.error]
+        out: Dict[str, dict] = {}
+        for stage in STAGES + ("total",):
+            if stage == "total":
+                values = [r.total for r in ok]
+            else:
+                values = [r.timings[stage] for r in ok if stage in r.timings]
+            values.sort()
+            stats = {"count": len(values), "sum": sum(values)}
+            for pct in PERCENTILES:
+                stats[f"p{pct}"] = _percentile(values, pct)
+            out[stage] = stats
+        return out
+
+    def totals(self) -> Dict[str, int]:
+        return {
+            "genes": len(self.records),
+            "errors": sum(1 for r in self.records if r.error),
+            "bytes_downloaded": sum(r.bytes_downloaded for r in self.records),
+            "rows_parsed": sum(r.rows_parsed for r in self.records),
+            "retries": sum(r.retries for r in self.records),
+        }
+
+    # ---------- output formats ----------
+    def jsonl(self) -> str:
+        """One JSON line per gene, then one line with the batch summary."""
+        lines = [json.dumps(r.as_dict()) for r in self.records]
+        lines.append(json.dumps({"summary": self.summary(), "totals": self.totals()}))
+        return "\n".join(lines) + "\n"
+
+    def write_jsonl(self, path: str) -> str:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(self.jsonl())
+        return path
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format (summary + counters)."""
+        lines = [
+            "# HELP ortholog_fetch_stage_seconds Time spent per fetch stage.",
+            "# TYPE ortholog_fetch_stage_seconds summary",
+        ]
+        for stage, stats in self.summary().items():
+            for pct in PERCENTILES:
+                value = stats[f"p{pct}"]
+                if value is not None:
+                    lines.append(
+                        f'ortholog_fetch_stage_seconds{{stage="{stage}",quantile="{pct / 100}"}} {value:.6f}'
+                    )
+            lines.append(f'ortholog_fetch_stage_seconds_sum{{stage="{stage}"}} {stats["sum"]:.6f}')
+            lines.append(f'ortholog_fetch_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+
+        for name, value in self.totals().items():
+            metric = f"ortholog_fetch_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
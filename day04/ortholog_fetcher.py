@@ -3,12 +3,23 @@ Business-logic module
 ---------------------
 Fetches orthologs for a Drosophila gene (FBgn…) using DIOPT and writes them
 to an Excel file.  Requires: requests, pandas, openpyxl
+
+Pass a fetch_metrics.FetchMetrics to fetch_and_save() to record per-stage
+timings for each gene.
+
+requests and pandas are imported inside _fetch_table()/_parse_table(), so
+importing this module (or running it with --help) stays fast.
+
+Command line:  python ortholog_fetcher.py FBgn0000099 human out_folder
 """
 
 from __future__ import annotations
-import os, re, html
-from typing import Dict
-import requests, pandas as pd
+import argparse, io, os, re, html, time
+from typing import TYPE_CHECKING, Dict, List, Optional
+from fetch_metrics import FetchMetrics, GeneRecord, NULL_RECORD
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 DIOPT_URL = "https://www.flyrnai.org/cgi-bin/DRSC_orthologs.pl"
 
@@ -26,6 +37,11 @@ SPECIES2TAX: Dict[str, str] = {
 # Looser pattern: “FBgn” + ≥5 digits, internal whitespace OK
 FBGN_RE = re.compile(r"^fbgn\s*\d{5,}$", re.IGNORECASE)
 
+# A download that times out, can't connect or gets a 5xx answer is tried
+# again RETRIES times, waiting RETRY_WAIT seconds (doubled each time) first
+RETRIES = 2
+RETRY_WAIT = 1.0
+
 # ---------------------------------------------------------------------------
 
 def _clean_fbgn(text: str) -> str:
@@ -35,8 +51,8 @@ def _clean_fbgn(text: str) -> str:
         clean = "FBgn" + clean.lstrip("fbgn")
     return clean
 
-def _fetch_table(fbgn: str, taxid: str) -> pd.DataFrame:
-    params = {
+def _diopt_params(fbgn: str, taxid: str) -> Dict[str, str]:
+    return {
         "gene_list": fbgn,
         "input_species": "7227",          # D. melanogaster
         "output_species": taxid,
@@ -44,46 +60,113 @@ def _fetch_table(fbgn: str, taxid: str) -> pd.DataFrame:
         "search_fields": "FLYBASE",
         "additional_filter": "None",
     }
-    resp = requests.get(DIOPT_URL, params=params, timeout=20)
-    resp.raise_for_status()
-
-    tables = pd.read_html(resp.text)
-    if not tables:
-        raise RuntimeError("No table found in DIOPT response.")
-
-    df = tables[0]
 
-    # Skip blank header rows / promote real header
-    while df.iloc[0].isna().all():
-        df = df.iloc[1:]
-    df.columns = df.iloc[0]
-    df = df.iloc[1:].reset_index(drop=True)
-
-    return df.applymap(lambda x: html.unescape(x) if isinstance(x, str) else x)
+def _fetch_table(fbgn: str, taxid: str, rec: GeneRecord = NULL_RECORD,
+                 retries: int = RETRIES) -> pd.DataFrame:
+    import requests   # heavy: only needed for an actual fetch
+
+    # the download stage includes the waits between retries
+    with rec.stage("download"):
+        for attempt in range(retries + 1):
+            if attempt:
+                rec.retries += 1
+                time.sleep(RETRY_WAIT * 2 ** (attempt - 1))
+            try:
+                resp = requests.get(DIOPT_URL, params=_diopt_params(fbgn, taxid), timeout=20)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == retries:
+                    raise
+                continue
+            if resp.status_code < 500 or attempt == retries:
+                break
+        resp.raise_for_status()
+    rec.bytes_downloaded += len(resp.content)
+
+    return _parse_table(resp.text, rec)
+
+def _parse_table(text: str, rec: GeneRecord = NULL_RECORD) -> pd.DataFrame:
+    """Turn a DIOPT results page into a DataFrame (first table, real header)."""
+    import pandas as pd
+
+    with rec.stage("parse"):
+        # newer pandas no longer accepts literal HTML, only file-like objects
+        tables = pd.read_html(io.StringIO(text))
+        if not tables:
+            raise RuntimeError("No table found in DIOPT response.")
+
+        df = tables[0]
+
+        # Skip blank header rows / promote real header
+        while df.iloc[0].isna().all():
+            df = df.iloc[1:]
+        df.columns = df.iloc[0]
+        df = df.iloc[1:].reset_index(drop=True)
+    rec.rows_parsed += len(df)
+
+    with rec.stage("unescape"):
+        # DataFrame.applymap was renamed to DataFrame.map in pandas 2.1
+        elementwise = df.map if hasattr(df, "map") else df.applymap
+        return elementwise(lambda x: html.unescape(x) if isinstance(x, str) else x)
 
 # ---------------------------------------------------------------------------
 
-def fetch_and_save(fbgn_raw: str, organism: str, out_dir: str) -> str:
+def fetch_and_save(fbgn_raw: str, organism: str, out_dir: str,
+                   metrics: Optional[FetchMetrics] = None) -> str:
     fbgn = _clean_fbgn(fbgn_raw)
 
-    if not FBGN_RE.match(fbgn):
-        raise ValueError("That doesn’t look like a FlyBase gene ID (example: FBgn0000099).")
-
-    taxid = SPECIES2TAX.get(organism.lower())
-    if not taxid:
-        raise ValueError(f"Unsupported organism: {organism}")
-
-    if not os.path.isdir(out_dir):
-        raise FileNotFoundError(f"Output folder not found: {out_dir}")
+    # start the record first so genes that fail validation are counted too
+    rec = metrics.start(fbgn, organism) if metrics is not None else NULL_RECORD
+    try:
+        if not FBGN_RE.match(fbgn):
+            raise ValueError("That doesn’t look like a FlyBase gene ID (example: FBgn0000099).")
+
+        taxid = SPECIES2TAX.get(organism.lower())
+        if not taxid:
+            raise ValueError(f"Unsupported organism: {organism}")
+
+        if not os.path.isdir(out_dir):
+            raise FileNotFoundError(f"Output folder not found: {out_dir}")
+
+        df = _fetch_table(fbgn, taxid, rec)
+        if df.empty:
+            raise RuntimeError(f"No orthologs returned for {fbgn} → {organism}.")
+
+        out_path = os.path.join(
+            out_dir,
+            f"{fbgn}_orthologs_{organism.replace(' ', '_')}.xlsx"
+        )
+        with rec.stage("write"):
+            df.to_excel(out_path, index=False)   # swap to .csv if you prefer
+    except Exception as exc:
+        rec.error = str(exc)
+        raise
 
-    df = _fetch_table(fbgn, taxid)
-    if df.empty:
-        raise RuntimeError(f"No orthologs returned for {fbgn} → {organism}.")
+    return out_path
 
-    out_path = os.path.join(
-        out_dir,
-        f"{fbgn}_orthologs_{organism.replace(' ', '_')}.xlsx"
-    )
-    df.to_excel(out_path, index=False)   # swap to .csv if you prefer
+# ---------------------------------------------------------------------------
 
-    return out_path
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Download DIOPT orthologs for FlyBase genes")
+    parser.add_argument("fbgn", nargs="+", help="FlyBase gene ID(s), e.g. FBgn0000099")
+    parser.add_argument("organism", choices=sorted(SPECIES2TAX), help="Target organism")
+    parser.add_argument("out_dir", help="Folder for the Excel files")
+    parser.add_argument("--metrics", metavar="FILE.jsonl",
+                        help="Write per-gene timings as JSON lines")
+    args = parser.parse_args(argv)
+
+    metrics = FetchMetrics() if args.metrics else None
+    failed = 0
+    for gene in args.fbgn:
+        try:
+            print(fetch_and_save(gene, args.organism, args.out_dir, metrics=metrics))
+        except Exception as exc:
+            failed += 1
+            print(f"{gene}: {exc}")
+
+    if metrics is not None:
+        metrics.write_jsonl(args.metrics)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -85,7 +85,10 @@ class OrthologGUI(tk.Frame):
             self.status.config(text="Failed.")
             messagebox.showerror("Error", str(exc))
 
-if __name__ == "__main__":
+def main():
     root = tk.Tk()
     OrthologGUI(root)
     root.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Tests for the fetch metrics in ortholog_fetcher.py / fetch_metrics.py,
+# using the saved DIOPT page in benchmarks/fixtures instead of the network.
+from pathlib import Path
+import json
+import sys
+
+import pytest
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+import ortholog_fetcher
+from fetch_metrics import FetchMetrics, NULL_RECORD
+
+FIXTURE = HERE.parent / "benchmarks" / "fixtures" / "diopt_FBgn0000099_human.html"
+
+
+class FakeResponse:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} Server Error")
+
+
+@pytest.fixture
+def fake_diopt(monkeypatch):
+    requests = pytest.importorskip("requests")
+    pytest.importorskip("openpyxl")
+    page = FIXTURE.read_text(encoding="utf-8")
+    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: FakeResponse(page))
+    return page
+
+
+def test_metrics_for_good_and_bad_genes(fake_diopt, tmp_path):
+    metrics = FetchMetrics()
+    out = ortholog_fetcher.fetch_and_save("FBgn0000099", "human", str(tmp_path), metrics=metrics)
+    assert Path(out).exists()
+    for gene, organism, folder in [("FBgn0000099", "human", str(tmp_path / "missing")),
+                                   ("not a gene", "human", str(tmp_path)),
+                                   ("FBgn0000099", "martian", str(tmp_path))]:
+        with pytest.raises((ValueError, FileNotFoundError)):
+            ortholog_fetcher.fetch_and_save(gene, organism, folder, metrics=metrics)
+
+    lines = [json.loads(line) for line in metrics.jsonl().splitlines()]
+    genes, batch = lines[:-1], lines[-1]
+    assert len(genes) == 4
+    assert genes[0]["error"] is None
+    assert genes[0]["bytes_downloaded"] == len(fake_diopt.encode("utf-8"))
+    assert genes[0]["rows_parsed"] > 0
+    assert set(genes[0]["timings"]) == {"download", "parse", "unescape", "write"}
+    assert all(g["error"] for g in genes[1:])
+    assert batch["totals"]["genes"] == 4
+    assert batch["totals"]["errors"] == 3
+    assert batch["summary"]["total"]["count"] == 1          # failures don't count as 0 s fetches
+    assert batch["summary"]["total"]["p50"] == pytest.approx(genes[0]["total"], abs=1e-6)
+
+    prom = metrics.prometheus()
+    assert "ortholog_fetch_genes_total 4" in prom
+    assert "ortholog_fetch_errors_total 3" in prom
+    assert 'ortholog_fetch_stage_seconds_count{stage="download"} 1' in prom
+    assert 'ortholog_fetch_stage_seconds_count{stage="total"} 1' in prom
+
+
+def test_uninstrumented_fetch_leaves_null_record_empty(fake_diopt, tmp_path):
+    ortholog_fetcher.fetch_and_save("FBgn0000099", "human", str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        ortholog_fetcher.fetch_and_save("FBgn0000099", "human", str(tmp_path / "missing"))
+    assert NULL_RECORD.bytes_downloaded == 0
+    assert NULL_RECORD.rows_parsed == 0
+    assert NULL_RECORD.error is None
+
+
+def test_retries_are_counted(fake_diopt, tmp_path, monkeypatch):
+    requests = pytest.importorskip("requests")
+    monkeypatch.setattr(ortholog_fetcher, "RETRY_WAIT", 0)
+    answers = [requests.ConnectionError("reset"), FakeResponse("busy", 503), FakeResponse(fake_diopt)]
+
+    def flaky_get(*args, **kwargs):
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    monkeypatch.setattr(requests, "get", flaky_get)
+    metrics = FetchMetrics()
+    ortholog_fetcher.fetch_and_save("FBgn0000099", "human", str(tmp_path), metrics=metrics)
+    assert metrics.records[0].retries == 2
+    assert metrics.records[0].bytes_downloaded == len(fake_diopt.encode("utf-8"))
+
+    answers[:] = [FakeResponse("busy", 503)] * 3
+    with pytest.raises(requests.HTTPError):
+        ortholog_fetcher.fetch_and_save("FBgn0000099", "human", str(tmp_path), metrics=metrics)
+    assert metrics.records[1].retries == 2
+    assert "ortholog_fetch_retries_total 4" in metrics.prometheus()
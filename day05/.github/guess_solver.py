@@ -0,0 +1,293 @@
+#Solver for Move_mode: works out which number to guess so the secret is found in as few guesses as possible on average.
+#In Move_mode the secret moves by random.choice([-2, -1, 0, 1, 2]) after every wrong guess, so halving the range is no longer the best strategy.
+#
+#How it works:
+#   - the "belief" is a list of weights, one per number the secret could be (a probability distribution)
+#   - a guess splits the belief into "smaller" and "bigger" parts; each part is then spread out by the drift
+#   - beliefs are rounded to whole counts out of `resolution` and shifted to start at 0, so the same shape
+#     reached from different numbers is the same state; states are memoized and solved together
+#     (value iteration, because the drift lets a game reach the same state again)
+#   - only guesses that leave at most 50% + window of the weight on either side are tried; beliefs wider
+#     than exact_width are simply split at the median (the drift hardly matters there), which keeps
+#     large ranges fast
+#
+#The result is a table: one row [guess, smaller_state, smaller_shift, bigger_state, bigger_shift] per state,
+#so a hint or an auto-play move is one list lookup.
+#
+#Usage:
+#   python guess_solver.py                       (writes guess_table_1_50.json)
+#   python guess_solver.py --high 500 --simulate 2000
+
+import argparse
+import json
+import os
+import random
+
+DRIFT = (-2, -1, 0, 1, 2)
+DEFAULT_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "guess_table_1_50.json")
+
+
+def quantize(weights, resolution):
+    """Round weights to whole counts summing to resolution; returns (counts, offset).
+
+    Leading and trailing zeros are cut off and offset says how many were cut at the start.
+    """
+    total = sum(weights)
+    raw = [w * resolution / total for w in weights]
+    counts = [int(r) for r in raw]
+    leftover = resolution - sum(counts)
+    by_remainder = sorted(range(len(raw)), key=lambda i: counts[i] - raw[i])
+    for i in by_remainder[:leftover]:
+        counts[i] += 1
+
+    start = 0
+    while counts[start] == 0:
+        start += 1
+    end = len(counts)
+    while counts[end - 1] == 0:
+        end -= 1
+    return tuple(counts[start:end]), start
+
+
+def apply_drift(weights, drift=DRIFT):
+    """Spread the weights by the drift; the result starts at min(drift)."""
+    low = min(drift)
+    spread = [0] * (len(weights) + max(drift) - low)
+    for i, w in enumerate(weights):
+        if w:
+            for d in drift:
+                spread[i + d - low] += w
+    return spread
+
+
+def split(state, guess, drift=DRIFT, resolution=256):
+    """Outcomes of guessing position `guess` of a state.
+
+    Returns two (probability, child state, shift) tuples, for "smaller" and "bigger".
+    shift is where the child's position 0 is, relative to this state's position 0.
+    A side that cannot happen is (0.0, None, 0).
+    """
+    total = sum(state)
+    outcomes = []
+    for part, start in ((state[:guess], 0), (state[guess + 1:], guess + 1)):
+        mass = sum(part)
+        if not mass:
+            outcomes.append((0.0, None, 0))
+            continue
+        spread = apply_drift(part, drift)
+        child, offset = quantize(spread, max(resolution, 4 * len(spread)))
+        outcomes.append((mass / total, child, start + min(drift) + offset))
+    return outcomes
+
+
+def candidate_guesses(state, window=0.2, exact_width=64):
+    """Positions worth trying: near the weighted median (only the median for wide states)."""
+    total = sum(state)
+    below = 0
+    median = None
+    candidates = []
+    for g, w in enumerate(state):
+        above = total - below - w
+        if median is None and below + w >= total / 2:
+            median = g
+        if below <= (0.5 + window) * total and above <= (0.5 + window) * total:
+            candidates.append(g)
+        below += w
+    if len(state) > exact_width or not candidates:
+        return [median]
+    return candidates
+
+
+def solve(low=1, high=50, drift=DRIFT, resolution=256, window=0.2, exact_width=64, tol=1e-9):
+    """Find the guessing policy with the fewest expected guesses for a secret in low..high.
+
+    Returns the table as a dict (see the top of this file); table["expected_guesses"]
+    is the expected number of guesses from the start, counting the correct one.
+    """
+    drift = tuple(drift)
+    start = (1,) * (high - low + 1)
+    ids = {start: 0}
+    states = [start]
+    moves = []   # per state: list of (guess, p_smaller, smaller_id, smaller_shift, p_bigger, bigger_id, bigger_shift)
+
+    i = 0
+    while i < len(states):
+        state = states[i]
+        options = []
+        for g in candidate_guesses(state, window, exact_width):
+            row = [g]
+            for p, child, shift in split(state, g, drift, resolution):
+                if child is None:
+                    row += [0.0, -1, 0]
+                    continue
+                if child not in ids:
+                    ids[child] = len(states)
+                    states.append(child)
+                row += [p, ids[child], shift]
+            options.append(row)
+        moves.append(options)
+        i += 1
+
+    # Value iteration: value[s] = 1 + min over guesses of the expected value of what follows
+    value = [0.0] * len(states)
+    choice = [0] * len(states)
+    while True:
+        change = 0.0
+        for s in reversed(range(len(states))):
+            best = None
+            for k, (g, p1, c1, _, p2, c2, _) in enumerate(moves[s]):
+                v = 1.0 + (p1 * value[c1] if c1 >= 0 else 0.0) + (p2 * value[c2] if c2 >= 0 else 0.0)
+                if best is None or v < best:
+                    best, choice[s] = v, k
+            change = max(change, abs(best - value[s]))
+            value[s] = best
+        if change < tol:
+            break
+
+    # Keep only the states the policy can actually reach, renumbered from 0
+    keep = {0: 0}
+    order = [0]
+    for s in order:
+        _, _, c1, _, _, c2, _ = moves[s][choice[s]]
+        for c in (c1, c2):
+            if c >= 0 and c not in keep:
+                keep[c] = len(order)
+                order.append(c)
+
+    rows = []
+    for s in order:
+        g, _, c1, shift1, _, c2, shift2 = moves[s][choice[s]]
+        rows.append([g, keep.get(c1, -1), shift1, keep.get(c2, -1), shift2])
+
+    return {
+        "low": low,
+        "high": high,
+        "drift": list(drift),
+        "resolution": resolution,
+        "expected_guesses": round(value[0], 6),
+        "states": rows,
+    }
+
+
+def save_table(table, path=DEFAULT_TABLE):
+    with open(path, "w") as f:
+        json.dump(table, f, separators=(",", ":"))
+
+
+def load_table(path=DEFAULT_TABLE):
+    with open(path) as f:
+        return json.load(f)
+
+
+#Using the table during a game. A position is (state id, number at position 0 of that state).
+
+def start_position(table):
+    """Position at the start of a round."""
+    return (0, table["low"])
+
+
+def suggest(table, position):
+    """The guess the table recommends at this position."""
+    state, origin = position
+    return origin + table["states"][state][0]
+
+
+def advance(table, position, bigger):
+    """Position after the suggested guess was wrong (bigger=True means "My number is bigger.").
+
+    Returns None when the table has no entry for what happened; use belief_guess() from then on.
+    """
+    state, origin = position
+    _, smaller_state, smaller_shift, bigger_state, bigger_shift = table["states"][state]
+    child, shift = (bigger_state, bigger_shift) if bigger else (smaller_state, smaller_shift)
+    if child < 0:
+        return None
+    return (child, origin + shift)
+
+
+#Exact belief tracking, for when the player guesses something other than the suggestion.
+
+def start_belief(low=1, high=50):
+    """(first number, weights): every number in low..high equally likely."""
+    return (low, [1.0] * (high - low + 1))
+
+
+def update_belief(belief, guess, bigger, drift=DRIFT):
+    """Belief after a wrong guess and the game's answer (then the drift)."""
+    origin, weights = belief
+    cut = guess - origin
+    if bigger:
+        start = max(cut + 1, 0)
+    else:
+        start = 0
+        weights = weights[:max(cut, 0)]
+    weights = weights[start:]
+    if not any(weights):
+        return start_belief(guess + 1, guess + 1) if bigger else start_belief(guess - 1, guess - 1)
+    return (origin + start + min(drift), [float(w) for w in apply_drift(weights, drift)])
+
+
+def belief_guess(belief):
+    """Weighted median of a belief, a good guess when the table can't be used."""
+    origin, weights = belief
+    total = sum(weights)
+    below = 0.0
+    for i, w in enumerate(weights):
+        below += w
+        if below >= total / 2:
+            return origin + i
+    return origin + len(weights) - 1
+
+
+def simulate(table, games=1000, seed=0, use_table=True):
+    """Average number of guesses when following the table against the real game rules.
+
+    With use_table=False every guess is belief_guess() instead (the baseline the
+    table has to beat).  Game i always gets the same secret and the same drift
+    steps for a given seed, so two strategies can be compared game by game.
+    """
+    drift = table["drift"]
+    guesses = 0
+    for game in range(games):
+        rng = random.Random(seed * 1_000_003 + game)
+        secret = rng.randint(table["low"], table["high"])
+        position = start_position(table) if use_table else None
+        belief = start_belief(table["low"], table["high"])
+        while True:
+            guess = suggest(table, position) if position else belief_guess(belief)
+            guesses += 1
+            if guess == secret:
+                break
+            bigger = secret > guess
+            if position:
+                position = advance(table, position, bigger)
+            belief = update_belief(belief, guess, bigger, drift)
+            secret += rng.choice(drift)
+    return guesses / games
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the best Move_mode guessing strategy")
+    parser.add_argument("--low", type=int, default=1)
+    parser.add_argument("--high", type=int, default=50)
+    parser.add_argument("--resolution", type=int, default=256, help="Counts per belief (higher = finer)")
+    parser.add_argument("--no-drift", action="store_true", help="Solve the game without Move_mode")
+    parser.add_argument("--simulate", type=int, default=0, metavar="GAMES",
+                        help="Play this many random games with the table and report the average")
+    parser.add_argument("-o", "--output", help="Where to write the table (default: guess_table_LOW_HIGH.json)")
+    args = parser.parse_args(argv)
+
+    drift = (0,) if args.no_drift else DRIFT
+    table = solve(args.low, args.high, drift, args.resolution)
+    output = args.output or os.path.join(os.path.dirname(DEFAULT_TABLE),
+                                         f"guess_table_{args.low}_{args.high}.json")
+    save_table(table, output)
+    print(f"{len(table['states'])} states, expected guesses: {table['expected_guesses']:.3f}")
+    print(f"Table written to {output}")
+    if args.simulate:
+        print(f"Simulated average over {args.simulate} games: {simulate(table, args.simulate):.3f} "
+              f"(median guessing: {simulate(table, args.simulate, use_table=False):.3f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#This version of the game includes all of the previous features, including the addition of the 'h' (hint) and 'a' (auto-play) commands.
+#'h' shows the best next guess and 'a' lets the computer finish the round. In Move_mode the best guesses come from a precomputed table (see guess_solver.py).
+
+import random
+import guess_solver
+DEBUG = True
+Move_mode = True
+
+def load_strategy():
+    """Load the Move_mode strategy table, solving and saving it the first time."""
+    try:
+        return guess_solver.load_table()
+    except (OSError, ValueError):
+        print("Working out the best Move_mode strategy (only needed once)...")
+        table = guess_solver.solve(1, 50)
+        guess_solver.save_table(table)
+        return table
+
+def new_tracker(table):
+    """What the computer knows about the secret at the start of a round."""
+    position = guess_solver.start_position(table) if Move_mode else None
+    return {"position": position, "belief": guess_solver.start_belief(1, 50)}
+
+def best_guess(table, tracker):
+    if tracker["position"] is not None:
+        return guess_solver.suggest(table, tracker["position"])
+    return guess_solver.belief_guess(tracker["belief"])
+
+def update_tracker(table, tracker, guess, bigger):
+    """Update what is known after a wrong guess and the game's answer."""
+    position = tracker["position"]
+    if position is not None and Move_mode and guess == guess_solver.suggest(table, position):
+        tracker["position"] = guess_solver.advance(table, position, bigger)
+    else:
+        tracker["position"] = None #off the table, use the belief from now on
+    drift = guess_solver.DRIFT if Move_mode else (0,)
+    tracker["belief"] = guess_solver.update_belief(tracker["belief"], guess, bigger, drift)
+
+def main():
+    global DEBUG
+    global Move_mode
+
+    table = load_strategy()
+    print("I'm thinking of a number between 1 and 50...")
+
+    while True: #outer loop to allow multiple games until the player decides to quite.
+        secret_number = random.randint(1,50)
+        tracker = new_tracker(table)
+        auto_play = False
+        while True: #this will allow multiple guesses until the player gets it right or stops guessing.
+            if DEBUG:
+                print(f"[DEBUG] Secret number is: {secret_number}")
+            if Move_mode:
+                print("Moving mode is enabled. The secret number will change +/- 2 after each guess.")
+
+            if auto_play:
+                user_input = str(best_guess(table, tracker))
+                print(f"Computer guesses: {user_input}")
+            else:
+                user_input = input("Take a guess (or 'x' to quit and end gameplay, 's' to reveal secret number and end gameplay, 'm' to turn on Move Mode, 'n' to generate a new number within your current game, 'h' for a hint, or 'a' to let the computer finish this round. A new game will start after you guess correctly, until you end gameplay.):")
+
+            if user_input.lower() == 'x':   #if the player wants to quit, they should type 'x'.
+                print("game over")
+                return
+            if user_input.lower() == 's':  #if the player wants the answer, they should type 's'.
+                print(f"The secret number is: {secret_number}")
+                return
+            if user_input.strip() == "":
+                print("Please enter a guess, 's' to reveal the secret number, or 'x' to quit.")
+                continue
+            if user_input.lower() == 'd': #if the player wants to toggle debug mode, they should type 'd'.
+                DEBUG = not DEBUG
+                state = "ON" if DEBUG else "OFF"
+                print(f"Debug mode is now {state}.")
+                continue
+
+            if user_input.lower() == 'm': #if the player wants to toggle moving mode, they should type 'm'.
+                Move_mode = not Move_mode
+                state_move = "ON" if Move_mode else "OFF"
+                print(f"Moving mode is now {state_move}.")
+                tracker["position"] = None #the table only fits a round played entirely in Move_mode
+                continue
+            if user_input.lower() == 'n': #if the player wants to start a new game, they should type 'n'.
+                secret_number = random.randint(1,50)
+                tracker = new_tracker(table)
+                print("Starting a new game!")
+                continue
+            if user_input.lower() == 'h': #if the player wants a hint, they should type 'h'.
+                print(f"Hint: try {best_guess(table, tracker)}.")
+                continue
+            if user_input.lower() == 'a': #if the player wants the computer to finish the round, they should type 'a'.
+                auto_play = True
+                continue
+
+            try: # Otherwise, put in an integer between 1 and 50 to guess.
+                guess = int(user_input)
+            except ValueError:
+                print("Invalid input. Please enter a number between 1 and 50, 's' to reveal the secret number, or 'x' to quit.")
+                continue
+
+            if guess < secret_number:
+                print("My number is bigger.")
+            elif guess > secret_number:
+                print("My number is smaller.")
+            else:
+                print("You guessed it! Well done!")
+                break #once the player guesses correctly, the game will end (the loop ends).
+            update_tracker(table, tracker, guess, guess < secret_number)
+            if Move_mode:
+                secret_number = secret_number + random.choice([-2, -1, 0, 1, 2])
+
+if __name__ == "__main__":
+    main()
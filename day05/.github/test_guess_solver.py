@@ -0,0 +1,57 @@
+# Tests for guess_solver.py (the Move_mode strategy table)
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import guess_solver
+
+
+@pytest.fixture(scope="module")
+def table():
+    return guess_solver.solve(1, 50)
+
+
+def test_quantize_sums_to_resolution_and_trims_zeros():
+    counts, offset = guess_solver.quantize([0, 0, 1, 2, 1, 0], 100)
+    assert sum(counts) == 100
+    assert offset == 2
+    assert counts == (25, 50, 25)
+
+
+def test_without_drift_matches_binary_search():
+    # 1..50 without moving takes 4.86 guesses on average with halving
+    table = guess_solver.solve(1, 50, drift=(0,))
+    assert table["expected_guesses"] == pytest.approx(4.86, abs=0.05)
+
+
+def test_move_mode_table_plays_every_secret(table):
+    assert guess_solver.suggest(table, guess_solver.start_position(table)) in range(20, 32)
+    for secret in range(1, 51):
+        position = guess_solver.start_position(table)
+        for _ in range(100):
+            guess = guess_solver.suggest(table, position)
+            if guess == secret:
+                break
+            position = guess_solver.advance(table, position, secret > guess)
+            assert position is not None
+        else:
+            pytest.fail(f"never guessed {secret} (without moving)")
+
+
+def test_table_beats_median_guessing(table):
+    # Same seed = same secrets and drift steps for both strategies. The gap is
+    # small (about 0.05 guesses), so it takes many games to see it reliably.
+    with_table = guess_solver.simulate(table, games=60_000, seed=0)
+    median_only = guess_solver.simulate(table, games=60_000, seed=0, use_table=False)
+    assert with_table < median_only - 0.02
+    assert with_table == pytest.approx(table["expected_guesses"], abs=0.1)
+
+
+def test_belief_follows_the_answers():
+    belief = guess_solver.update_belief(guess_solver.start_belief(1, 50), 10, bigger=False)
+    # secret was 1..9, then moved by up to 2 either way
+    assert belief[0] == -1
+    assert len(belief[1]) == 13
+    assert guess_solver.belief_guess(belief) in range(4, 7)
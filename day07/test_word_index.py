@@ -0,0 +1,104 @@
+# Tests for word_index.py
+from pathlib import Path
+import os
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import word_index
+from word_index import WordIndex
+
+
+def build(tmp_path, files):
+    for name, text in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    index = WordIndex(str(tmp_path / "words.idx"))
+    index.add_roots([str(tmp_path / "docs")])
+    index.update()
+    index.save()
+    return WordIndex.load(str(tmp_path / "words.idx"))
+
+
+def test_varint_and_pairs_round_trip():
+    out = bytearray()
+    for n in (0, 1, 127, 128, 300, 2 ** 40):
+        word_index.write_varint(out, n)
+    pos, values = 0, []
+    while pos < len(out):
+        n, pos = word_index.read_varint(out, pos)
+        values.append(n)
+    assert values == [0, 1, 127, 128, 300, 2 ** 40]
+
+    pairs = [(0, 5), (3, 1), (1000, 2)]
+    assert word_index.decode_pairs(word_index.encode_pairs(pairs)) == pairs
+
+
+def test_count_and_top(tmp_path):
+    index = build(tmp_path, {
+        "docs/a.txt": "The cat sat on the mat.",
+        "docs/b.txt": "the dog, the cat and THE bird",
+        "docs/notes/c.txt": "dog dog dog",
+    })
+    assert index.count("the") == {"docs/a.txt": 2, "docs/b.txt": 3}
+    assert index.count("dog", "docs/notes/*") == {"docs/notes/c.txt": 3}
+    assert index.count("zebra") == {}
+    assert index.top(n=2) == [("the", 5), ("dog", 4)]
+    assert index.top("docs/a.txt", n=1) == [("the", 2)]
+
+
+def test_update_only_reads_changed_files(tmp_path):
+    index = build(tmp_path, {"docs/a.txt": "one two", "docs/b.txt": "two three"})
+    (tmp_path / "docs/b.txt").write_text("three three three")
+    os.utime(tmp_path / "docs/b.txt", ns=(1, 1))
+    (tmp_path / "docs/c.txt").write_text("four")
+    (tmp_path / "docs/a.txt").unlink()
+
+    assert index.update() == (2, 0, 1)
+    index.save()
+    index = WordIndex.load(str(tmp_path / "words.idx"))
+    assert [doc["path"] for doc in index.docs] == ["docs/c.txt", "docs/b.txt"]   # c took a's id
+    assert index.count("three") == {"docs/b.txt": 3}
+    assert index.count("two") == {}
+    assert index.update() == (0, 2, 0)
+
+
+def test_update_leaves_other_documents_alone(tmp_path):
+    index = build(tmp_path, {f"docs/{name}.txt": f"shared {name}only {name}only"
+                             for name in ("a", "b", "c", "d")})
+    forward = {doc["path"]: index._forward[i] for i, doc in enumerate(index.docs)}
+    postings = list(index._postings)
+    data = index._data
+
+    (tmp_path / "docs/b.txt").write_text("shared brand new words")
+    assert index.update() == (1, 3, 0)
+    for i, doc in enumerate(index.docs):
+        if doc["path"] != "docs/b.txt":
+            assert index._forward[i] == forward[doc["path"]]   # same id, same bytes
+    assert index._data.startswith(data)                       # nothing old was rewritten
+    touched = {index._term_ids[t] for t in ("shared", "bonly")}
+    assert [span for t, span in enumerate(postings) if t not in touched] == \
+           [span for t, span in enumerate(index._postings[:len(postings)]) if t not in touched]
+    assert index.count("bonly") == {}
+    assert index.count("brand") == {"docs/b.txt": 1}
+
+    (tmp_path / "docs/a.txt").unlink()       # d moves down into a's id
+    assert index.update() == (0, 3, 1)
+    index.save()
+    index = WordIndex.load(str(tmp_path / "words.idx"))
+    assert [doc["path"] for doc in index.docs] == ["docs/d.txt", "docs/b.txt", "docs/c.txt"]
+    assert index.count("shared") == {"docs/b.txt": 1, "docs/c.txt": 1, "docs/d.txt": 1}
+    assert index.count("donly") == {"docs/d.txt": 2}
+    assert index.doc_counts(0) == {"shared": 1, "donly": 2}
+    assert index.top(n=1) == [("shared", 3)]
+
+def test_non_ascii_words(tmp_path):
+    assert word_index.words("Café naïve שלום, don't STRASSE") == ["café", "naïve", "שלום", "don't", "strasse"]
+    index = build(tmp_path, {
+        "docs/a.txt": "Café au lait. CAFÉ noir! שלום שלום",
+        "docs/b.txt": "Straße und Strasse und cafe\u0301",
+    })
+    assert index.count("café") == {"docs/a.txt": 2, "docs/b.txt": 1}
+    assert index.count("Café", "docs/a.txt") == {"docs/a.txt": 2}
+    assert index.count("שלום") == {"docs/a.txt": 2}
+    assert index.count("straße") == {"docs/b.txt": 2}
@@ -0,0 +1,423 @@
+"""
+Word index
+----------
+The in-class word count reads a document and counts every word.  When the
+same documents are asked about again and again ("how often is X in each
+file?", "top words in the *.md files?") re-reading the text every time is
+wasted work, so this script reads it once and keeps an index on disk:
+
+- inverted index: word -> (document, count) for every document it is in
+- forward index:  document -> (word, count) for every word it contains
+- file info:      path, modification time and size of each document
+
+Queries only decode the part of the index they need.  `update` re-reads
+just the files whose modification time or size changed (and picks up new
+and deleted files) and rewrites only the postings of the words in those
+files; every other document keeps its id and its stored word list.
+
+Everything is stored as variable-length integers (7 bits per byte), lists
+of ids are stored as differences from the previous id, and the word list
+shares prefixes with the word before it, so the index is a lot smaller
+than the text.  `build` writes the words sorted; words that `update` finds
+for the first time are added at the end, and words that are no longer in
+any file keep an empty list until the next `build`.
+
+Usage:
+    python word_index.py build notes/ essay.txt --pattern "*.txt"
+    python word_index.py update
+    python word_index.py count the
+    python word_index.py top "notes/*" -n 20
+"""
+
+import argparse
+import fnmatch
+import os
+import re
+import unicodedata
+from collections import Counter
+
+DEFAULT_INDEX = "words.idx"
+MAGIC = b"WIDX\x01"
+WORD = re.compile(r"\w+(?:'\w+)*")
+
+
+def words(text):
+    """Case-folded words of a text, any language (apostrophes inside a word are kept).
+
+    Text is NFC-normalized first, so "é" typed as e + accent counts as "é".
+    """
+    return WORD.findall(unicodedata.normalize("NFC", text).casefold())
+
+
+# =========================
+# Integer encoding
+# =========================
+def write_varint(out, n):
+    """Append a non-negative integer to a bytearray, 7 bits per byte."""
+    while n >= 0x80:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def read_varint(data, pos):
+    """Read one integer written by write_varint; returns (value, new position)."""
+    n = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def write_str(out, text):
+    raw = text.encode("utf-8")
+    write_varint(out, len(raw))
+    out += raw
+
+
+def read_str(data, pos):
+    size, pos = read_varint(data, pos)
+    return bytes(data[pos:pos + size]).decode("utf-8"), pos + size
+
+
+def encode_pairs(pairs):
+    """[(id, count), ...] sorted by id -> bytes (ids stored as differences)."""
+    out = bytearray()
+    write_varint(out, len(pairs))
+    previous = 0
+    for ident, count in pairs:
+        write_varint(out, ident - previous)
+        write_varint(out, count)
+        previous = ident
+    return bytes(out)
+
+
+def decode_pairs(data, pos=0):
+    """Inverse of encode_pairs; returns a list of (id, count)."""
+    size, pos = read_varint(data, pos)
+    pairs = []
+    ident = 0
+    for _ in range(size):
+        delta, pos = read_varint(data, pos)
+        count, pos = read_varint(data, pos)
+        ident += delta
+        pairs.append((ident, count))
+    return pairs
+
+
+def _shared_prefix(a, b):
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+# =========================
+# Index
+# =========================
+class WordIndex:
+    """Word counts for a set of documents, saved in one file.
+
+    docs is a list of dicts (path, mtime_ns, size, tokens); ids in the
+    postings and forward lists are positions in docs and in terms.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX):
+        self.path = path
+        self.base = os.path.dirname(os.path.abspath(path))
+        self.roots = []          # (folder or file, filename pattern) that were indexed
+        self.docs = []
+        self.terms = []
+        self._term_ids = {}
+        self._postings = []      # per term: (start, end) in _data
+        self._forward = []       # per doc: (start, end) in _data
+        self._data = b""
+
+    # ---- loading and saving ----
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX):
+        """Read an index file (only the tables; word lists are decoded when used)."""
+        index = cls(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{path} is not a word index; run 'build' again")
+        pos = len(MAGIC)
+
+        n, pos = read_varint(data, pos)
+        for _ in range(n):
+            root, pos = read_str(data, pos)
+            pattern, pos = read_str(data, pos)
+            index.roots.append((root, pattern))
+
+        n, pos = read_varint(data, pos)
+        forward_sizes = []
+        for _ in range(n):
+            doc = {}
+            doc["path"], pos = read_str(data, pos)
+            doc["mtime_ns"], pos = read_varint(data, pos)
+            doc["size"], pos = read_varint(data, pos)
+            doc["tokens"], pos = read_varint(data, pos)
+            size, pos = read_varint(data, pos)
+            index.docs.append(doc)
+            forward_sizes.append(size)
+
+        n, pos = read_varint(data, pos)
+        postings_sizes = []
+        term = ""
+        for _ in range(n):
+            shared, pos = read_varint(data, pos)
+            suffix, pos = read_str(data, pos)
+            term = term[:shared] + suffix
+            size, pos = read_varint(data, pos)
+            index.terms.append(term)
+            postings_sizes.append(size)
+
+        for sizes, spans in ((postings_sizes, index._postings), (forward_sizes, index._forward)):
+            for size in sizes:
+                spans.append((pos, pos + size))
+                pos += size
+
+        index._term_ids = {t: i for i, t in enumerate(index.terms)}
+        index._data = data
+        return index
+
+    def save(self):
+        """Write the index file; returns its size in bytes."""
+        out = bytearray(MAGIC)
+        write_varint(out, len(self.roots))
+        for root, pattern in self.roots:
+            write_str(out, root)
+            write_str(out, pattern)
+
+        write_varint(out, len(self.docs))
+        for doc, (start, end) in zip(self.docs, self._forward):
+            write_str(out, doc["path"])
+            write_varint(out, doc["mtime_ns"])
+            write_varint(out, doc["size"])
+            write_varint(out, doc["tokens"])
+            write_varint(out, end - start)
+
+        write_varint(out, len(self.terms))
+        previous = ""
+        for term, (start, end) in zip(self.terms, self._postings):
+            shared = _shared_prefix(previous, term)
+            write_varint(out, shared)
+            write_str(out, term[shared:])
+            write_varint(out, end - start)
+            previous = term
+
+        for start, end in self._postings + self._forward:
+            out += self._data[start:end]
+
+        with open(self.path, "wb") as f:
+            f.write(out)
+        return len(out)
+
+    # ---- building ----
+    def _abs(self, path):
+        return os.path.normpath(os.path.join(self.base, path))
+
+    def _rel(self, path):
+        return os.path.relpath(os.path.abspath(path), self.base).replace(os.sep, "/")
+
+    def _files(self):
+        """Every file currently matched by the indexed roots (paths relative to the index)."""
+        found = set()
+        for root, pattern in self.roots:
+            full = self._abs(root)
+            if os.path.isfile(full):
+                found.add(root)
+                continue
+            for folder, _, names in os.walk(full):
+                for name in fnmatch.filter(names, pattern):
+                    found.add(self._rel(os.path.join(folder, name)))
+        found.discard(self._rel(self.path))
+        return sorted(found)
+
+    def _pairs(self, span):
+        """Decoded (id, count) list stored at span in _data (a new word has no span yet)."""
+        if span is None:
+            return []
+        start, end = span
+        return decode_pairs(self._data[start:end])
+
+    def doc_counts(self, doc_id):
+        """Counter of the words in one indexed document."""
+        return Counter({self.terms[t]: c for t, c in self._pairs(self._forward[doc_id])})
+
+    def add_roots(self, paths, pattern="*.txt"):
+        for path in paths:
+            root = (self._rel(path), pattern)
+            if root not in self.roots:
+                self.roots.append(root)
+
+    def update(self):
+        """Re-read new and changed files, drop deleted ones; returns (read, reused, removed).
+
+        Unchanged documents keep their id and their word list as it is; only the
+        postings of words in a changed, new or deleted document are rewritten.
+        Deleted documents leave holes that new documents (or the last documents,
+        moved down) fill, so ids stay 0..len(docs)-1.
+        """
+        old = {doc["path"]: i for i, doc in enumerate(self.docs)}
+        files = self._files()
+        stats = {path: os.stat(self._abs(path)) for path in files}
+        kept = [i for path, i in old.items() if path in stats]
+        added = [path for path in files if path not in old]
+        n = len(kept) + len(added)
+
+        # new ids: documents past the end move into the lowest holes, new files take the rest
+        holes = sorted(set(range(n)) - set(kept))
+        moved = {i: holes.pop(0) for i in sorted(i for i in kept if i >= n)}
+        new_ids = {path: holes.pop(0) for path in added}
+
+        changed = {}     # new id -> Counter of words, for files that have to be read
+        docs = [None] * n
+        forward = [None] * n
+        for path in files:
+            stat = stats[path]
+            doc = {"path": path, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            i = old.get(path)
+            doc_id = new_ids[path] if i is None else moved.get(i, i)
+            if i is not None and (self.docs[i]["mtime_ns"], self.docs[i]["size"]) == (doc["mtime_ns"], doc["size"]):
+                doc["tokens"] = self.docs[i]["tokens"]
+                forward[doc_id] = self._forward[i]
+            else:
+                with open(self._abs(path), encoding="utf-8", errors="replace") as f:
+                    changed[doc_id] = Counter(words(f.read()))
+                doc["tokens"] = sum(changed[doc_id].values())
+            docs[doc_id] = doc
+
+        # new words get ids after the existing ones (sorted among themselves)
+        for term in sorted(set().union(*changed.values()) - self._term_ids.keys()):
+            self._term_ids[term] = len(self.terms)
+            self.terms.append(term)
+
+        # postings edits: term id -> {doc id: new count, 0 to remove}; removals first
+        edits = {}
+        for i, doc in enumerate(self.docs):
+            if doc["path"] not in stats or i in moved or moved.get(i, i) in changed:
+                for term_id, _ in self._pairs(self._forward[i]):
+                    edits.setdefault(term_id, {})[i] = 0
+        blobs = []
+        for doc_id, doc_counts in changed.items():
+            pairs = sorted((self._term_ids[t], c) for t, c in doc_counts.items())
+            blobs.append(("forward", doc_id, encode_pairs(pairs)))
+            for term_id, c in pairs:
+                edits.setdefault(term_id, {})[doc_id] = c
+        for i, doc_id in moved.items():
+            if doc_id not in changed:
+                for term_id, c in self._pairs(self._forward[i]):
+                    edits.setdefault(term_id, {})[doc_id] = c
+
+        self._postings += [None] * (len(self.terms) - len(self._postings))
+        for term_id, edit in edits.items():
+            postings = dict(self._pairs(self._postings[term_id]))
+            for doc_id, c in edit.items():
+                if c:
+                    postings[doc_id] = c
+                else:
+                    postings.pop(doc_id, None)
+            blobs.append(("postings", term_id, encode_pairs(sorted(postings.items()))))
+
+        # the new lists go after the existing data; save() leaves out what is no longer used
+        data = bytearray(self._data)
+        for table, ident, blob in blobs:
+            span = (len(data), len(data) + len(blob))
+            data += blob
+            if table == "forward":
+                forward[ident] = span
+            else:
+                self._postings[ident] = span
+        self._data = bytes(data)
+        self._forward = forward
+        self.docs = docs
+        return len(changed), len(files) - len(changed), len(old) - len(kept)
+
+    # ---- queries ----
+    def _matching(self, pattern):
+        return [i for i, doc in enumerate(self.docs)
+                if pattern is None or fnmatch.fnmatch(doc["path"], pattern)]
+
+    def count(self, word, pattern=None):
+        """{path: count} for every document (matching pattern) containing word."""
+        term_id = self._term_ids.get(unicodedata.normalize("NFC", word).casefold())
+        if term_id is None:
+            return {}
+        start, end = self._postings[term_id]
+        result = {}
+        for doc_id, c in decode_pairs(self._data[start:end]):
+            path = self.docs[doc_id]["path"]
+            if pattern is None or fnmatch.fnmatch(path, pattern):
+                result[path] = c
+        return result
+
+    def top(self, pattern=None, n=10):
+        """The n most common words, over all documents or those whose path matches pattern."""
+        totals = Counter()
+        for doc_id in self._matching(pattern):
+            start, end = self._forward[doc_id]
+            for term_id, c in decode_pairs(self._data[start:end]):
+                totals[term_id] += c
+        return [(self.terms[t], c) for t, c in totals.most_common(n)]
+
+
+# =========================
+# Command Line
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query a word index of text files")
+    parser.add_argument("-i", "--index", default=DEFAULT_INDEX, help="Index file (default: words.idx)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Index files and folders (replaces the index)")
+    build.add_argument("paths", nargs="+", help="Files or folders to index")
+    build.add_argument("--pattern", default="*.txt", help="File names to index inside folders")
+
+    add = commands.add_parser("update", help="Re-read changed files; optionally add more paths")
+    add.add_argument("paths", nargs="*", help="Extra files or folders to index")
+    add.add_argument("--pattern", default="*.txt", help="File names to index inside new folders")
+
+    count = commands.add_parser("count", help="How often a word appears in each file")
+    count.add_argument("word")
+    count.add_argument("--files", metavar="GLOB", help="Only files whose path matches GLOB")
+
+    top = commands.add_parser("top", help="Most common words")
+    top.add_argument("files", nargs="?", metavar="GLOB", help="Only files whose path matches GLOB")
+    top.add_argument("-n", type=int, default=10, help="How many words to show")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = WordIndex(args.index)
+    else:
+        try:
+            index = WordIndex.load(args.index)
+        except OSError:
+            parser.error(f"no index at {args.index}; run 'build' first")
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    if args.command in ("build", "update"):
+        index.add_roots(args.paths, args.pattern)
+        read, reused, removed = index.update()
+        size = index.save()
+        print(f"{len(index.docs)} files, {len(index.terms)} words: read {read}, "
+              f"reused {reused}, removed {removed}; index is {size} bytes")
+    elif args.command == "count":
+        counts = index.count(args.word, args.files)
+        for path, c in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+            print(f"{c:8d}  {path}")
+        print(f"{sum(counts.values()):8d}  total in {len(counts)} file(s)")
+    else:
+        for word, c in index.top(args.files, args.n):
+            print(f"{c:8d}  {word}")
+
+
+if __name__ == "__main__":
+    main()
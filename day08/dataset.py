@@ -0,0 +1,59 @@
+"""
+Dataset helpers
+---------------
+Shared by the day08 scripts: finds the Epicurious CSV on disk, downloading
+it with kagglehub the first time (see README for the Kaggle setup), and the
+column names / diet categories the analyses agree on.
+"""
+
+import os
+
+DATASET = "hugodarwood/epirecipes"
+
+# Nutrition columns in the Epicurious CSV
+NUTRITION_COLS = ["protein", "calories", "fat", "sodium"]
+
+# Numeric columns that are not 0/1 tags
+NON_TAG_COLS = NUTRITION_COLS + ["rating"]
+
+# Diet categories, in the order they are checked and plotted
+CATEGORIES = ["Vegan", "Vegetarian", "Fish", "Meat/Poultry"]
+DIET_COLS = ["vegan", "vegetarian", "fish"]
+
+# Nutrition columns used by the graphs: first matching column name wins
+POSSIBLE_COLS = {
+    "protein": ["protein"],
+    "calories": ["calories", "calorie", "cal"],
+    "fat": ["fat", "sodium"],
+}
+
+
+def map_columns(columns):
+    """Map protein/calories/fat to the actual CSV column names."""
+    actual_cols = {}
+    for key, possible_names in POSSIBLE_COLS.items():
+        for col_name in possible_names:
+            if col_name in columns:
+                actual_cols[key] = col_name
+                break
+    return actual_cols
+
+
+def find_csv(path=None):
+    """Return the path of the recipe CSV.
+
+    `path` may be a CSV file or a folder containing one.  When it is None the
+    dataset is downloaded (or found in the cache) with kagglehub.
+    """
+    if path is None:
+        import kagglehub  # only needed when no local copy is given
+        path = kagglehub.dataset_download(DATASET)
+
+    if os.path.isfile(path):
+        return path
+
+    for file in sorted(os.listdir(path)):
+        if file.endswith('.csv'):
+            return os.path.join(path, file)
+
+    raise FileNotFoundError(f"No CSV file found in {path}")
@@ -9,73 +9,96 @@ Graphs generated (each saved as a separate file):
 2. Protein box-and-whisker plot by category
 3. Calories box-and-whisker plot by category
 4. Fat box-and-whisker plot by category
+
+Optional: python graphs.py --profile report.json
+times every stage (library imports, dataset lookup, CSV parse, ..., each
+figure's draw and savefig), records peak RSS and DataFrame memory, and
+writes a JSON report.
+
+Graphs whose data and settings did not change since the last run are not
+redrawn (cache in .plot_cache.json); use --force to redraw everything.
+
+Importing this module does nothing; the analysis runs in main().
 """
 
 # =========================
 # Imports & Dependencies
 # =========================
-import os
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import kagglehub
+import argparse
+import sys
+
+from dataset import CATEGORIES, POSSIBLE_COLS, find_csv, map_columns
+from lazy import lazy_import, load_now
+from plot_cache import PlotCache
+from stage_profiler import StageProfiler
+
+# Heavy libraries are only imported when first used
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+
+# Diet categories and nutrition column names are shared with the other
+# day08 scripts (see dataset.py)
+categories = CATEGORIES
+possible_cols = POSSIBLE_COLS
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Epicurious recipe nutrition graphs")
+    parser.add_argument("csv", nargs="?",
+                        help="Recipe CSV or folder (default: download with kagglehub)")
+    parser.add_argument("--profile", metavar="REPORT.json",
+                        help="Time each stage and write a JSON profiling report")
+    parser.add_argument("--force", action="store_true",
+                        help="Redraw every graph even if the cached PNG is up to date")
+    return parser.parse_args(argv)
+
 
 # =========================
 # Load Dataset
 # =========================
-print("Loading Epicurious dataset...")
-try:
-    # Download/retrieve the dataset path using kagglehub
-    path = kagglehub.dataset_download("hugodarwood/epirecipes")
-    print(f"Dataset path: {path}")
-    
-    # Find the CSV file
-    csv_file = None
-    for file in os.listdir(path):
-        if file.endswith('.csv'):
-            csv_file = os.path.join(path, file)
-            break
-    
-    if csv_file is None:
-        raise FileNotFoundError("No CSV file found in the dataset")
-    
-    df = pd.read_csv(csv_file)
+def load_dataset(prof, path=None):
+    print("Loading Epicurious dataset...")
+    with prof.stage("dataset_lookup"):
+        # Download/retrieve the dataset with kagglehub unless a path was given
+        csv_file = find_csv(path)
+        print(f"Dataset path: {csv_file}")
+
+    with prof.stage("csv_parse"):
+        df = pd.read_csv(csv_file)
+    prof.record_frame("loaded", df)
     print(f"Dataset loaded successfully! Shape: {df.shape}")
     print(f"Columns: {df.columns.tolist()}")
+    return df
 
-except Exception as e:
-    print(f"Error loading dataset: {e}")
-    exit(1)
 
 # =========================
 # Clean Data
 # =========================
-print("Cleaning data...")
-
-# Define nutrition columns - check which ones exist
-nutrition_cols = []
-possible_cols = {
-    "protein": ["protein"],
-    "calories": ["calories", "calorie", "cal"],
-    "fat": ["fat", "sodium"]
-}
+def clean_data(df, prof):
+    """Map the nutrition column names and drop rows missing any of them.
+
+    Returns (df, actual_cols) where actual_cols maps protein/calories/fat to
+    the column names found in the CSV.
+    """
+    print("Cleaning data...")
+
+    # Map the actual column names
+    with prof.stage("column_mapping"):
+        actual_cols = map_columns(df.columns)
+        nutrition_cols = list(actual_cols.values())
 
-# Map the actual column names
-actual_cols = {}
-for key, possible_names in possible_cols.items():
-    for col_name in possible_names:
-        if col_name in df.columns:
-            actual_cols[key] = col_name
-            nutrition_cols.append(col_name)
-            break
+    if len(nutrition_cols) < 3:
+        print(f"Warning: Could only find {len(nutrition_cols)} out of 3 nutrition columns")
+        print(f"Found: {nutrition_cols}")
+        print(f"All available columns: {df.columns.tolist()}")
 
-if len(nutrition_cols) < 3:
-    print(f"Warning: Could only find {len(nutrition_cols)} out of 3 nutrition columns")
-    print(f"Found: {nutrition_cols}")
-    print(f"All available columns: {df.columns.tolist()}")
+    # Keep only rows with relevant nutrition data
+    with prof.stage("dropna"):
+        df = df.dropna(subset=nutrition_cols)
+    prof.record_frame("after_dropna", df)
+    return df, actual_cols
 
-# Keep only rows with relevant nutrition data
-df = df.dropna(subset=nutrition_cols)
 
 # =========================
 # Recipe Categorization
@@ -91,121 +114,176 @@ def categorize_recipe(row):
     else:
         return "Meat/Poultry"
 
-df["category"] = df.apply(categorize_recipe, axis=1)
 
-# Filter to only include our categories
-categories = ["Vegan", "Vegetarian", "Fish", "Meat/Poultry"]
-df = df[df["category"].isin(categories)]
+def categorize(df, prof):
+    with prof.stage("categorize"):
+        df = df.assign(category=df.apply(categorize_recipe, axis=1))
 
-print(f"Total recipes after filtering: {len(df)}")
-print(f"Category distribution:\n{df['category'].value_counts()}\n")
+        # Filter to only include our categories
+        df = df[df["category"].isin(categories)]
+    prof.record_frame("categorized", df)
 
-# Get actual column names for the nutrition data
-protein_col = actual_cols.get("protein", "protein")
-calories_col = actual_cols.get("calories", "calories")
-fat_col = actual_cols.get("fat", "fat")
+    print(f"Total recipes after filtering: {len(df)}")
+    print(f"Category distribution:\n{df['category'].value_counts()}\n")
+    return df
 
-# =========================
-# Graph 1: Pie Chart
-# =========================
-print("Generating Graph 1: Recipe Category Distribution...")
-category_counts = df["category"].value_counts()
-
-plt.figure(figsize=(8, 8))
-plt.pie(
-    category_counts,
-    labels=category_counts.index,
-    autopct="%1.1f%%",
-    startangle=140
-)
-plt.title("Recipe Category Distribution (Epicurious)")
-plt.savefig("graph_1_recipe_category_pie.png", dpi=150, bbox_inches='tight')
-plt.close()
 
 # =========================
-# Graph 2: Protein Box Plot
+# Figure Rendering (cached)
 # =========================
-print("Generating Graph 2: Protein Content by Category...")
-plt.figure(figsize=(10, 6))
-sns.boxplot(
-    data=df,
-    x="category",
-    y=protein_col,
-    order=categories,
-    showfliers=True
-)
-sns.stripplot(
-    data=df,
-    x="category",
-    y=protein_col,
-    order=categories,
-    color="black",
-    alpha=0.3,
-    jitter=True
-)
-plt.title("Protein Content by Recipe Category")
-plt.ylabel("Protein (g)")
-plt.xlabel("Recipe Category")
-plt.savefig("graph_2_protein_boxplot.png", dpi=150, bbox_inches='tight')
-plt.close()
+# A figure is skipped when its PNG exists and neither the data it plots nor
+# its settings changed since it was last drawn (see plot_cache.py).
+# Every setting the draw functions use comes from the spec, so it is part of
+# the cache key; the styles below are copied into each figure's spec.
+PIE_STYLE = {
+    "kind": "pie",
+    "figsize": (8, 8),
+    "autopct": "%1.1f%%",
+    "startangle": 140,
+}
+BOXPLOT_STYLE = {
+    "kind": "box+strip",
+    "figsize": (10, 6),
+    "showfliers": True,
+    "strip": {"color": "black", "alpha": 0.3, "jitter": True},
+    "xlabel": "Recipe Category",
+}
+
+
+def _library_versions():
+    from importlib.metadata import PackageNotFoundError, version
+
+    versions = {}
+    for name in ("matplotlib", "seaborn"):
+        try:
+            versions[name] = version(name)
+        except PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def render_figure(n, filename, data, spec, draw, cache, prof):
+    """Draw and save one figure unless the cached PNG is still valid."""
+    spec = {**spec, "filename": filename, "dpi": 150, **_library_versions()}
+    with prof.stage(f"graph_{n}.hash"):
+        key = cache.key(data, spec)
+    if cache.is_fresh(filename, key):
+        print(f"  {filename} is up to date, skipping")
+        return
+    with prof.stage(f"graph_{n}.draw"):
+        draw(data, spec)
+    with prof.stage(f"graph_{n}.savefig"):
+        plt.savefig(filename, dpi=spec["dpi"], bbox_inches='tight')
+        plt.close()
+    cache.record(filename, key)
+
+
+def draw_pie(data, spec):
+    category_counts = data["category"].value_counts()
+
+    plt.figure(figsize=spec["figsize"])
+    plt.pie(
+        category_counts,
+        labels=category_counts.index,
+        autopct=spec["autopct"],
+        startangle=spec["startangle"]
+    )
+    plt.title(spec["title"])
+
+
+def draw_boxplot(data, spec):
+    plt.figure(figsize=spec["figsize"])
+    sns.boxplot(
+        data=data,
+        x="category",
+        y=spec["column"],
+        order=spec["order"],
+        showfliers=spec["showfliers"]
+    )
+    sns.stripplot(
+        data=data,
+        x="category",
+        y=spec["column"],
+        order=spec["order"],
+        **spec["strip"]
+    )
+    plt.title(spec["title"])
+    plt.ylabel(spec["ylabel"])
+    plt.xlabel(spec["xlabel"])
+
+
+def draw_graphs(df, actual_cols, cache, prof):
+    # Get actual column names for the nutrition data
+    protein_col = actual_cols.get("protein", "protein")
+    calories_col = actual_cols.get("calories", "calories")
+    fat_col = actual_cols.get("fat", "fat")
+
+    # =========================
+    # Graph 1: Pie Chart
+    # =========================
+    print("Generating Graph 1: Recipe Category Distribution...")
+    render_figure(1, "graph_1_recipe_category_pie.png", df[["category"]], {
+        **PIE_STYLE,
+        "title": "Recipe Category Distribution (Epicurious)",
+    }, draw_pie, cache, prof)
+
+    # =========================
+    # Graphs 2-4: Box Plots
+    # =========================
+    boxplots = [
+        (2, "graph_2_protein_boxplot.png", protein_col,
+         "Protein Content by Recipe Category", "Protein (g)"),
+        (3, "graph_3_calories_boxplot.png", calories_col,
+         "Calories by Recipe Category", "Calories"),
+        (4, "graph_4_fat_boxplot.png", fat_col,
+         "Fat Content by Recipe Category", "Fat (g)"),
+    ]
+    for n, filename, column, title, ylabel in boxplots:
+        print(f"Generating Graph {n}: {title}...")
+        render_figure(n, filename, df[["category", column]], {
+            **BOXPLOT_STYLE,
+            "column": column,
+            "order": categories,
+            "title": title,
+            "ylabel": ylabel,
+        }, draw_boxplot, cache, prof)
 
-# =========================
-# Graph 3: Calories Box Plot
-# =========================
-print("Generating Graph 3: Calories by Category...")
-plt.figure(figsize=(10, 6))
-sns.boxplot(
-    data=df,
-    x="category",
-    y=calories_col,
-    order=categories,
-    showfliers=True
-)
-sns.stripplot(
-    data=df,
-    x="category",
-    y=calories_col,
-    order=categories,
-    color="black",
-    alpha=0.3,
-    jitter=True
-)
-plt.title("Calories by Recipe Category")
-plt.ylabel("Calories")
-plt.xlabel("Recipe Category")
-plt.savefig("graph_3_calories_boxplot.png", dpi=150, bbox_inches='tight')
-plt.close()
 
 # =========================
-# Graph 4: Fat Box Plot
+# Main
 # =========================
-print("Generating Graph 4: Fat Content by Category...")
-plt.figure(figsize=(10, 6))
-sns.boxplot(
-    data=df,
-    x="category",
-    y=fat_col,
-    order=categories,
-    showfliers=True
-)
-sns.stripplot(
-    data=df,
-    x="category",
-    y=fat_col,
-    order=categories,
-    color="black",
-    alpha=0.3,
-    jitter=True
-)
-plt.title("Fat Content by Recipe Category")
-plt.ylabel("Fat (g)")
-plt.xlabel("Recipe Category")
-plt.savefig("graph_4_fat_boxplot.png", dpi=150, bbox_inches='tight')
-plt.close()
-
-print("\nAll graphs generated successfully!")
-print("Output files:")
-print("  - graph_1_recipe_category_pie.png")
-print("  - graph_2_protein_boxplot.png")
-print("  - graph_3_calories_boxplot.png")
-print("  - graph_4_fat_boxplot.png")
\ No newline at end of file
+def main(argv=None):
+    args = parse_args(argv)
+    prof = StageProfiler(enabled=args.profile is not None)
+
+    if args.profile:
+        # import up front so the import time isn't charged to csv_parse / graph_1
+        with prof.stage("imports"):
+            load_now(pd, plt, sns)
+
+    try:
+        df = load_dataset(prof, args.csv)
+    except Exception as e:
+        print(f"Error loading dataset: {e}")
+        return 1
+
+    df, actual_cols = clean_data(df, prof)
+    df = categorize(df, prof)
+    draw_graphs(df, actual_cols, PlotCache(enabled=not args.force), prof)
+
+    print("\nAll graphs generated successfully!")
+    print("Output files:")
+    print("  - graph_1_recipe_category_pie.png")
+    print("  - graph_2_protein_boxplot.png")
+    print("  - graph_3_calories_boxplot.png")
+    print("  - graph_4_fat_boxplot.png")
+
+    if args.profile:
+        print("\nProfile (slowest first):")
+        print(prof.summary())
+        print(f"Profiling report written to {prof.write(args.profile)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
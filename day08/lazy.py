@@ -0,0 +1,45 @@
+"""
+Lazy imports
+------------
+numpy, pandas, matplotlib and seaborn take a noticeable fraction of a second
+to import.  The day08 scripts bind them with lazy_import() instead, so the
+real import only happens the first time an attribute is used, and things
+like `--help` or a cache hit never pay for it.
+
+    np = lazy_import("numpy")
+    plt = lazy_import("matplotlib.pyplot")
+"""
+
+import importlib
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        # underscore name so it can't hide a real module attribute (np.load)
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def load_now(*modules):
+    """Import lazy modules right away, e.g. inside a timed "imports" stage."""
+    for module in modules:
+        if isinstance(module, LazyModule):
+            module._load()
@@ -0,0 +1,56 @@
+"""
+Plot cache
+----------
+Make-style cache for figures: a figure is only re-rendered when the data it
+depends on or its plot settings changed, or when the PNG is missing.
+
+The key of a figure is a SHA-256 of
+- the exact data subset it plots (pandas row hashes + column names/dtypes)
+- its plot spec (columns, order, dpi, figsize, titles, library versions, ...)
+Keys are stored per output file in a small JSON manifest.
+"""
+
+import hashlib
+import json
+import os
+
+from lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+MANIFEST = ".plot_cache.json"
+
+
+class PlotCache:
+    def __init__(self, manifest=MANIFEST, enabled=True):
+        self.manifest = manifest
+        self.enabled = enabled
+        self.entries = {}
+        if os.path.exists(manifest):
+            try:
+                with open(manifest, encoding="utf-8") as fh:
+                    self.entries = json.load(fh)
+            except (OSError, ValueError):
+                self.entries = {}  # unreadable manifest: rebuild everything
+
+    @staticmethod
+    def key(data, spec):
+        """Hash of the data subset a figure uses together with its spec."""
+        h = hashlib.sha256()
+        h.update(json.dumps(spec, sort_keys=True, default=str).encode())
+        h.update(json.dumps([[str(c), str(t)] for c, t in data.dtypes.items()]).encode())
+        h.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+        return h.hexdigest()
+
+    def is_fresh(self, out_path, key):
+        """True if `out_path` exists and was built from the same key."""
+        return (self.enabled
+                and os.path.exists(out_path)
+                and self.entries.get(os.path.abspath(out_path)) == key)
+
+    def record(self, out_path, key):
+        self.entries[os.path.abspath(out_path)] = key
+        tmp = self.manifest + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.entries, fh, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest)
@@ -0,0 +1,262 @@
+"""
+Recipe Search (bitset index)
+----------------------------
+The Epicurious CSV is a wide 0/1 tag matrix plus nutrition columns.  This
+script indexes it once and then answers, without scanning the DataFrame:
+- tag filters: must have all of / any of / none of a set of tags
+- nutrition ranges: e.g. protein between 20 and 40 g
+- the k recipes most similar to a given recipe (Jaccard similarity of tags)
+
+How it works:
+- every tag gets a bitset over all recipes (one bit per recipe, packed into
+  64-bit words), so a tag filter is a handful of AND/OR/NOT over ~300 words
+- every nutrient is sorted once and cut into RANGE_BUCKETS equal buckets
+  with a precomputed "all recipes before this bucket" bitset; a range query
+  is two binary searches, one AND NOT of two of those bitsets, and setting
+  the bits of the few recipes in the two partial buckets at the ends
+- every recipe also gets a bitset over the tags; for Jaccard similarity the
+  bitsets of the target recipe's tags are unpacked and summed, which gives
+  |a & b| for every recipe at once, and |a | b| = |a| + |b| - |a & b|
+
+Usage:
+    python recipe_search.py [CSV] --tags vegan,dessert --exclude peanut --range protein=5:20
+    python recipe_search.py [CSV] --similar 123 -k 10
+"""
+
+# =========================
+# Imports & Dependencies
+# =========================
+import argparse
+import time
+
+from dataset import NUTRITION_COLS, find_csv
+from lazy import lazy_import
+from tag_stats import tag_columns
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+RANGE_BUCKETS = 64
+
+
+# =========================
+# Bitset Helpers
+# =========================
+def pack_rows(flags):
+    """Pack a 2-D bool array into little-endian uint64 words per row."""
+    flags = np.asarray(flags, dtype=bool)
+    packed = np.packbits(flags, axis=1, bitorder="little")
+    pad = -packed.shape[1] % 8
+    if pad or packed.shape[1] == 0:
+        packed = np.pad(packed, ((0, 0), (0, pad or 8)))
+    return np.ascontiguousarray(packed).view("<u8")
+
+
+def set_bits(words, rows):
+    """Set the bits for the given row numbers in a 1-D uint64 bitset (in place)."""
+    rows = np.asarray(rows, dtype=np.int64)
+    np.bitwise_or.at(words, rows >> 6, np.uint64(1) << (rows & 63).astype(np.uint64))
+    return words
+
+
+def unpack(bits, n):
+    """Indices of the set bits among the first n positions of a 1-D bitset."""
+    flags = np.unpackbits(bits.view(np.uint8), bitorder="little", count=n)
+    return np.flatnonzero(flags)
+
+
+# =========================
+# Index
+# =========================
+class RecipeIndex:
+    def __init__(self, df, tags=None, nutrients=NUTRITION_COLS):
+        self.df = df.reset_index(drop=True)
+        self.n = len(self.df)
+        self.tags = tags if tags is not None else tag_columns(self.df)
+        self.tag_pos = {tag: i for i, tag in enumerate(self.tags)}
+
+        T = self.df[self.tags].fillna(0).to_numpy(dtype=bool)   # recipes x tags
+        self.tag_bits = pack_rows(T.T)       # per tag: bitset over recipes
+        self.row_bits = pack_rows(T)         # per recipe: bitset over tags
+        self.row_counts = T.sum(axis=1)
+        self.all_bits = pack_rows(np.ones((1, self.n), dtype=bool))[0]
+
+        # per nutrient: recipe indices sorted by value (NaNs dropped), and
+        # prefix[j] = bitset of the first j * step recipes in that order
+        self.sorted_idx, self.sorted_vals, self.prefix_bits, self.range_step = {}, {}, {}, {}
+        n_words = len(self.all_bits)
+        for col in nutrients:
+            if col not in self.df.columns:
+                continue
+            values = self.df[col].to_numpy(dtype=float)
+            order = np.argsort(values, kind="stable")
+            order = order[~np.isnan(values[order])]
+            step = max(1, -(-len(order) // RANGE_BUCKETS))
+            prefix = np.zeros((len(order) // step + 1, n_words), dtype=np.uint64)
+            for j in range(1, len(prefix)):
+                prefix[j] = set_bits(prefix[j - 1].copy(), order[(j - 1) * step:j * step])
+            self.sorted_idx[col] = order
+            self.sorted_vals[col] = values[order]
+            self.prefix_bits[col] = prefix
+            self.range_step[col] = step
+
+    def _tag(self, tag):
+        try:
+            return self.tag_bits[self.tag_pos[tag]]
+        except KeyError:
+            raise KeyError(f"Unknown tag: {tag}") from None
+
+    def range_bits(self, column, low=None, high=None):
+        """Bitset of recipes with low <= column <= high (None = open end)."""
+        if column not in self.sorted_vals:
+            raise KeyError(f"Unknown nutrition column: {column}")
+        values = self.sorted_vals[column]
+        order = self.sorted_idx[column]
+        step = self.range_step[column]
+        start = 0 if low is None else int(np.searchsorted(values, low, side="left"))
+        stop = len(values) if high is None else int(np.searchsorted(values, high, side="right"))
+
+        first, last = -(-start // step), stop // step    # whole buckets first..last-1
+        if first < last:
+            prefix = self.prefix_bits[column]
+            bits = prefix[last] & ~prefix[first]
+            edges = np.concatenate([order[start:first * step], order[last * step:stop]])
+        else:
+            bits = np.zeros_like(self.all_bits)
+            edges = order[start:stop]
+        return set_bits(bits, edges)
+
+    def filter_bits(self, all_of=(), any_of=(), none_of=(), ranges=None):
+        """Bitset of recipes matching every condition."""
+        result = self.all_bits.copy()
+        for tag in all_of:
+            result &= self._tag(tag)
+        if any_of:
+            either = np.zeros_like(result)
+            for tag in any_of:
+                either |= self._tag(tag)
+            result &= either
+        for tag in none_of:
+            result &= ~self._tag(tag)
+        for column, (low, high) in (ranges or {}).items():
+            result &= self.range_bits(column, low, high)
+        return result
+
+    def filter(self, all_of=(), any_of=(), none_of=(), ranges=None):
+        """Row numbers of recipes matching every condition.
+
+        ranges maps a nutrient to (low, high), e.g. {"protein": (20, None)}.
+        """
+        return unpack(self.filter_bits(all_of, any_of, none_of, ranges), self.n)
+
+    def similar(self, i, k=10, within=None):
+        """The k recipes with the highest tag Jaccard similarity to recipe i.
+
+        `within` optionally restricts the candidates to a filter_bits() result.
+        Only recipes sharing at least one tag with recipe i are considered.
+        Returns a list of (row number, similarity), best first; ties go to
+        the lower row number.
+        """
+        if not 0 <= i < self.n:
+            raise IndexError(f"Recipe row {i} is out of range (0-{self.n - 1})")
+        tags = unpack(self.row_bits[i], len(self.tags))
+        flags = np.unpackbits(self.tag_bits[tags].view(np.uint8), axis=1,
+                              bitorder="little", count=self.n)
+        inter = flags.sum(axis=0, dtype=np.int32)       # |a & b| for every recipe
+        inter[i] = 0
+        if within is not None:
+            inter *= np.unpackbits(within.view(np.uint8), bitorder="little", count=self.n)
+
+        candidates = np.flatnonzero(inter)
+        k = min(k, len(candidates))
+        if k <= 0:
+            return []
+        shared = inter[candidates]
+        score = shared / (self.row_counts[candidates] + self.row_counts[i] - shared)
+
+        # the k best; candidates are in row order, so ties keep the lower rows
+        threshold = score[np.argpartition(-score, k - 1)[k - 1]]
+        best = np.flatnonzero(score > threshold)
+        best = np.concatenate([best, np.flatnonzero(score == threshold)[:k - len(best)]])
+        best = best[np.lexsort((best, -score[best]))]
+        return [(int(candidates[j]), float(score[j])) for j in best]
+
+    def rows(self, indices, columns=None):
+        """The DataFrame rows for a list of row numbers."""
+        if columns is None:
+            columns = [c for c in ["title"] + list(self.sorted_vals) if c in self.df.columns]
+        return self.df.loc[list(indices), columns]
+
+
+# =========================
+# Command Line
+# =========================
+def _parse_range(text):
+    """'protein=10:30' -> ('protein', (10.0, 30.0)); either side may be empty."""
+    column, _, bounds = text.partition("=")
+    low, _, high = bounds.partition(":")
+    return column, (float(low) if low else None, float(high) if high else None)
+
+
+def _split(text):
+    return [t.strip() for t in text.split(",") if t.strip()] if text else []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search Epicurious recipes by tags, nutrition and similarity")
+    parser.add_argument("csv", nargs="?", help="Recipe CSV (default: download with kagglehub)")
+    parser.add_argument("--tags", help="Comma-separated tags the recipe must all have")
+    parser.add_argument("--any", help="Comma-separated tags, at least one required")
+    parser.add_argument("--exclude", help="Comma-separated tags the recipe must not have")
+    parser.add_argument("--range", action="append", default=[], metavar="COL=LOW:HIGH",
+                        help="Nutrition range, e.g. protein=20:40 or calories=:500 (repeatable)")
+    parser.add_argument("--similar", help="Row number or exact title of a recipe")
+    parser.add_argument("-k", type=int, default=10, help="How many results to show")
+    args = parser.parse_args(argv)
+    ranges = {}
+    for text in args.range:
+        try:
+            column, bounds = _parse_range(text)
+        except ValueError:
+            parser.error(f"--range must look like protein=20:40, got {text!r}")
+        ranges[column] = bounds
+
+    df = pd.read_csv(find_csv(args.csv))
+    start = time.perf_counter()
+    index = RecipeIndex(df)
+    print(f"Indexed {index.n} recipes x {len(index.tags)} tags "
+          f"in {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    try:
+        bits = index.filter_bits(_split(args.tags), _split(args.any), _split(args.exclude), ranges)
+    except KeyError as exc:
+        parser.error(exc.args[0])
+    matches = unpack(bits, index.n)
+    print(f"{len(matches)} recipes match the filter ({(time.perf_counter() - start) * 1000:.3f} ms)")
+
+    if args.similar is None:
+        print(index.rows(matches[:args.k]).to_string())
+        return
+
+    if args.similar.isdigit():
+        target = int(args.similar)
+    else:
+        hits = np.flatnonzero(index.df.get("title", pd.Series(dtype=str)).str.strip() == args.similar.strip())
+        if not len(hits):
+            parser.error(f"No recipe titled {args.similar!r}")
+        target = int(hits[0])
+    if target >= index.n:
+        parser.error(f"--similar row {target} is out of range (0-{index.n - 1})")
+
+    start = time.perf_counter()
+    result = index.similar(target, args.k, within=bits)
+    print(f"Most similar to row {target} ({(time.perf_counter() - start) * 1000:.3f} ms):")
+    print(index.rows([target]).to_string(header=False))
+    table = index.rows([j for j, _ in result])
+    table.insert(0, "jaccard", [round(s, 3) for _, s in result])
+    print(table.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+Streaming (out-of-core) Epicurious Analysis
+-------------------------------------------
+Same analysis as graphs.py, but the CSV is read in chunks so memory stays
+flat no matter how big the recipe dump is.
+
+For every chunk:
+- keep only the columns we need (nutrition + vegan/vegetarian/fish)
+- drop rows with missing nutrition data and categorize the recipes
+- fold the values into one mergeable sketch per category and nutrient:
+  count / mean / variance / min / max, plus a t-digest for quantiles
+
+The four graphs are then drawn from the sketches alone (box plots are built
+from the sketch quantiles, so there is no strip plot of individual recipes,
+and only the min and max of each box can be shown as outliers).
+
+Usage:
+    python recipe_sketches.py [CSV] --chunksize 50000 --out-dir .
+"""
+
+# =========================
+# Imports & Dependencies
+# =========================
+import argparse
+import math
+import os
+
+from dataset import CATEGORIES, DIET_COLS, find_csv, map_columns
+from lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# ~400 centroids per sketch: quartiles within ~0.1% and p99.9 within ~1%
+# on skewed (lognormal) data; 200 gave ~15% error at p99.9
+DEFAULT_COMPRESSION = 800
+
+
+# =========================
+# Sketches
+# =========================
+class TDigest:
+    """Mergeable quantile sketch (merging t-digest, arcsine scale function).
+
+    Keeps at most about compression / 2 centroids, with small ones near the
+    tails, so extreme quantiles stay accurate.
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+            self._absorb(values, np.ones(len(values)))
+        return self
+
+    def merge(self, other):
+        if len(other.means):
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._absorb(other.means, other.weights)
+        return self
+
+    def _absorb(self, means, weights):
+        m = np.concatenate([self.means, means])
+        w = np.concatenate([self.weights, weights])
+        order = np.argsort(m, kind="stable")
+        m, w = m[order], w[order]
+
+        # Points whose mid-quantile falls in the same unit of the scale
+        # k(q) = compression / (2 pi) * asin(2q - 1) share a centroid.
+        q_mid = (np.cumsum(w) - w / 2) / w.sum()
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * q_mid - 1)
+        cluster = np.floor(k - k[0]).astype(np.int64)
+        _, cluster = np.unique(cluster, return_inverse=True)
+
+        self.weights = np.bincount(cluster, weights=w)
+        self.means = np.bincount(cluster, weights=w * m) / self.weights
+
+    def quantile(self, q):
+        """Approximate q-quantile (0 <= q <= 1); NaN when empty."""
+        if not len(self.means):
+            return math.nan
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        xs = np.concatenate([[self.min], self.means, [self.max]])
+        ps = np.concatenate([[0.0], centers, [total]])
+        return float(np.interp(q * total, ps, xs))
+
+
+class NutrientSketch:
+    """Count, mean, variance, min and max (mergeable) plus a t-digest."""
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.digest = TDigest(compression)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            other = NutrientSketch()
+            other.count = len(values)
+            other.mean = float(values.mean())
+            other.m2 = float(((values - other.mean) ** 2).sum())
+            self._combine_moments(other)
+            self.digest.update(values)
+        return self
+
+    def merge(self, other):
+        self._combine_moments(other)
+        self.digest.merge(other.digest)
+        return self
+
+    def _combine_moments(self, other):
+        # Chan et al. parallel update of mean and sum of squared deviations
+        n = self.count + other.count
+        if n == 0:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / n
+        self.count = n
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+    @property
+    def min(self):
+        return self.digest.min
+
+    @property
+    def max(self):
+        return self.digest.max
+
+    def quantile(self, q):
+        return self.digest.quantile(q)
+
+    def boxplot_stats(self, label, whis=1.5):
+        """Stats dict for matplotlib's Axes.bxp (same whisker rule as seaborn).
+
+        The sketch does not keep individual recipes, so only the minimum and
+        maximum can be drawn as outliers (at most 2 per box, where graphs.py
+        draws every one).
+        """
+        q1, med, q3 = (self.quantile(q) for q in (0.25, 0.5, 0.75))
+        iqr = q3 - q1
+        whislo = max(self.min, q1 - whis * iqr)
+        whishi = min(self.max, q3 + whis * iqr)
+        fliers = [v for v in (self.min, self.max) if v < whislo or v > whishi]
+        return {"label": label, "med": med, "q1": q1, "q3": q3, "mean": self.mean,
+                "whislo": whislo, "whishi": whishi, "fliers": fliers}
+
+
+# =========================
+# Chunked Loading
+# =========================
+def categorize_chunk(df):
+    """Vectorized version of graphs.categorize_recipe()."""
+    def flag(col):
+        return df[col].to_numpy() == 1 if col in df.columns else np.zeros(len(df), dtype=bool)
+
+    return np.select(
+        [flag("vegan"), flag("vegetarian"), flag("fish")],
+        CATEGORIES[:3],
+        default=CATEGORIES[3],
+    )
+
+
+def sketch_csv(csv_file, chunksize=50_000, compression=DEFAULT_COMPRESSION):
+    """Stream the CSV and return ({category: {key: NutrientSketch}}, actual_cols)."""
+    header = pd.read_csv(csv_file, nrows=0).columns
+    actual_cols = map_columns(header)
+    nutrition_cols = list(dict.fromkeys(actual_cols.values()))
+    usecols = nutrition_cols + [c for c in DIET_COLS if c in header]
+
+    sketches = {cat: {key: NutrientSketch(compression) for key in actual_cols}
+                for cat in CATEGORIES}
+
+    for chunk in pd.read_csv(csv_file, usecols=usecols, chunksize=chunksize):
+        chunk = chunk.dropna(subset=nutrition_cols)
+        category = categorize_chunk(chunk)
+        for cat in CATEGORIES:
+            rows = chunk[category == cat]
+            if rows.empty:
+                continue
+            for key, col in actual_cols.items():
+                sketches[cat][key].update(rows[col].to_numpy())
+
+    return sketches, actual_cols
+
+
+# =========================
+# Graphs
+# =========================
+def category_counts(sketches):
+    """Recipes per category (every nutrient sketch sees the same rows)."""
+    counts = {}
+    for cat, by_key in sketches.items():
+        counts[cat] = next(iter(by_key.values())).count if by_key else 0
+    return counts
+
+
+def draw_figures(sketches, out_dir="."):
+    import matplotlib.pyplot as plt
+
+    outputs = []
+
+    counts = {cat: n for cat, n in category_counts(sketches).items() if n}
+    counts = dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+    plt.figure(figsize=(8, 8))
+    plt.pie(list(counts.values()), labels=list(counts), autopct="%1.1f%%", startangle=140)
+    plt.title("Recipe Category Distribution (Epicurious)")
+    outputs.append(os.path.join(out_dir, "graph_1_recipe_category_pie.png"))
+    plt.savefig(outputs[-1], dpi=150, bbox_inches='tight')
+    plt.close()
+
+    boxplots = [
+        ("protein", "graph_2_protein_boxplot.png", "Protein Content by Recipe Category", "Protein (g)"),
+        ("calories", "graph_3_calories_boxplot.png", "Calories by Recipe Category", "Calories"),
+        ("fat", "graph_4_fat_boxplot.png", "Fat Content by Recipe Category", "Fat (g)"),
+    ]
+    for key, filename, title, ylabel in boxplots:
+        stats = [sketches[cat][key].boxplot_stats(cat)
+                 for cat in CATEGORIES if key in sketches[cat] and sketches[cat][key].count]
+        if not stats:
+            continue
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.bxp(stats, showfliers=True)
+        ax.set_title(title)
+        ax.set_ylabel(ylabel)
+        ax.set_xlabel("Recipe Category")
+        outputs.append(os.path.join(out_dir, filename))
+        fig.savefig(outputs[-1], dpi=150, bbox_inches='tight')
+        plt.close(fig)
+
+    return outputs
+
+
+# =========================
+# Command Line
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chunked, constant-memory version of graphs.py")
+    parser.add_argument("csv", nargs="?", help="Recipe CSV (default: download with kagglehub)")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="Rows per chunk")
+    parser.add_argument("--compression", type=int, default=DEFAULT_COMPRESSION,
+                        help="t-digest size/accuracy")
+    parser.add_argument("--out-dir", default=".", help="Folder for the PNG files")
+    args = parser.parse_args(argv)
+
+    csv_file = find_csv(args.csv)
+    print(f"Streaming {csv_file} in chunks of {args.chunksize} rows...")
+    sketches, actual_cols = sketch_csv(csv_file, args.chunksize, args.compression)
+
+    print(f"Category distribution: {category_counts(sketches)}")
+    for key, col in actual_cols.items():
+        print(f"{key} ({col}):")
+        for cat in CATEGORIES:
+            s = sketches[cat][key]
+            if s.count:
+                print(f"  {cat:13s} n={s.count:<7d} mean={s.mean:9.2f} "
+                      f"median={s.quantile(0.5):9.2f} std={s.std:9.2f}")
+
+    print("Output files:")
+    for out in draw_figures(sketches, args.out_dir):
+        print(f"  - {out}")
+
+
+if __name__ == "__main__":
+    main()
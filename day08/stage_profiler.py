@@ -0,0 +1,83 @@
+"""
+Stage profiler
+--------------
+Opt-in timing/memory report for graphs.py (python graphs.py --profile report.json).
+
+Each `with profiler.stage("name"):` block records wall time and the process'
+peak RSS when it finished; record_frame() stores DataFrame memory usage.
+A disabled profiler still runs the blocks but records nothing.
+"""
+
+import json
+import platform
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource  # not available on Windows
+except ImportError:
+    resource = None
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageProfiler:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stages = []
+        self.frames = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append({
+                "stage": name,
+                "seconds": round(time.perf_counter() - start, 6),
+                "peak_rss_bytes": peak_rss_bytes(),
+            })
+
+    def record_frame(self, name, df):
+        """Store the deep memory usage of a DataFrame under `name`."""
+        if self.enabled:
+            self.frames[name] = {
+                "rows": len(df),
+                "columns": df.shape[1],
+                "memory_bytes": int(df.memory_usage(deep=True).sum()),
+            }
+
+    def report(self):
+        return {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "total_seconds": round(time.perf_counter() - self._start, 6),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "stages": self.stages,
+            "dataframes": self.frames,
+        }
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.report(), fh, indent=2)
+        return path
+
+    def summary(self):
+        """Short text table, slowest stage first."""
+        lines = [f"{'stage':30s} {'seconds':>10s}"]
+        for s in sorted(self.stages, key=lambda s: s["seconds"], reverse=True):
+            lines.append(f"{s['stage']:30s} {s['seconds']:10.4f}")
+        return "\n".join(lines)
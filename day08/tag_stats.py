@@ -0,0 +1,176 @@
+"""
+Tag x Nutrition Statistics
+--------------------------
+graphs.py compares nutrition across four diet categories.  The Epicurious
+CSV also has hundreds of 0/1 tag columns ("vegan", "bake", "summer", ...).
+This script computes count, mean and quantiles of protein, calories, fat and
+sodium for every tag in one pass and writes a tidy table
+(one row per tag x nutrient) that can be ranked and plotted.
+
+How it works:
+- the tag columns become one boolean matrix T (recipes x tags)
+- counts and means come from two matrix products, T.T @ valid and T.T @ X,
+  instead of one groupby per tag; they are summed over blocks of
+  BLOCK_ROWS recipes, so only one block of T is ever converted to floats
+- quantiles: each nutrient is sorted once; the (tag, position) coordinates
+  of T's nonzero cells in that order give the k-th value of every tag at once
+
+Usage:
+    python tag_stats.py [CSV] --out tag_stats.csv --rank protein --top 20 --plot
+"""
+
+# =========================
+# Imports & Dependencies
+# =========================
+import argparse
+
+from dataset import NON_TAG_COLS, NUTRITION_COLS, find_csv
+from lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+QUANTILES = (0.25, 0.5, 0.75)
+RANK_BY = ("count", "mean", "q25", "q50", "q75")    # --by choices (columns of the default table)
+BLOCK_ROWS = 4096     # recipes per block of the matrix products
+
+
+# =========================
+# Tag Detection
+# =========================
+def tag_columns(df, exclude=NON_TAG_COLS):
+    """Return the names of all numeric columns that only hold 0, 1 or NaN."""
+    numeric = df.select_dtypes(include="number").drop(columns=exclude, errors="ignore")
+    values = numeric.to_numpy(dtype=float)
+    is_flag = (values == 0) | (values == 1) | np.isnan(values)
+    has_one = (values == 1).any(axis=0)
+    keep = is_flag.all(axis=0) & has_one
+    return numeric.columns[keep].tolist()
+
+
+# =========================
+# Statistics Engine
+# =========================
+def _column_quantiles(T, x, quantiles):
+    """Quantiles of `x` within every column of the boolean matrix `T`.
+
+    Uses linear interpolation, like pandas' default.  Returns an array of
+    shape (len(quantiles), n_tags); tags without values get NaN.
+    """
+    valid = ~np.isnan(x)
+    order = np.argsort(x[valid], kind="stable")
+    xs = x[valid][order]
+    n_tags = T.shape[1]
+
+    # Coordinates of the True cells, tag by tag, each tag's recipes in
+    # ascending order of x: the k-th value of tag t is xs[pos[start[t] + k]].
+    tag_idx, rows = np.nonzero(np.ascontiguousarray(T[valid][order].T))
+    n = np.bincount(tag_idx, minlength=n_tags)
+    start = np.cumsum(n) - n
+
+    def kth(rank):
+        """Value of the rank-th (0-based) tagged recipe, per tag."""
+        return xs[rows[start[has] + rank]]
+
+    out = np.full((len(quantiles), n_tags), np.nan)
+    has = n > 0
+    for qi, q in enumerate(quantiles):
+        pos = q * (n[has] - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        lo_val, hi_val = kth(lo), kth(hi)
+        out[qi, has] = lo_val + (hi_val - lo_val) * (pos - lo)
+    return out
+
+
+def tag_nutrition_stats(df, tags=None, nutrients=NUTRITION_COLS, quantiles=QUANTILES):
+    """Count, mean and quantiles of each nutrient for every tag.
+
+    Returns a tidy DataFrame with columns
+    tag, nutrient, count, mean, q25, q50, q75 (one column per quantile).
+    """
+    if tags is None:
+        tags = tag_columns(df)
+    nutrients = [c for c in nutrients if c in df.columns]
+
+    T = df[tags].fillna(0).to_numpy(dtype=bool)           # recipes x tags
+    X = df[nutrients].to_numpy(dtype=float)                # recipes x nutrients
+    valid = ~np.isnan(X)
+    X0 = np.where(valid, X, 0.0)
+
+    counts = np.zeros((len(tags), len(nutrients)))         # tags x nutrients
+    sums = np.zeros((len(tags), len(nutrients)))
+    for start in range(0, len(T), BLOCK_ROWS):
+        block = slice(start, start + BLOCK_ROWS)
+        Tf = T[block].T.astype(np.float64)                 # tags x block, not the whole matrix
+        counts += Tf @ valid[block]
+        sums += Tf @ X0[block]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+
+    frames = []
+    for j, nutrient in enumerate(nutrients):
+        q = _column_quantiles(T, X[:, j], quantiles)
+        frame = pd.DataFrame({
+            "tag": tags,
+            "nutrient": nutrient,
+            "count": counts[:, j].astype(int),
+            "mean": means[:, j],
+        })
+        for qi, quantile in enumerate(quantiles):
+            frame[f"q{round(quantile * 100):02d}"] = q[qi]
+        frames.append(frame)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def rank_tags(stats, nutrient, by="mean", min_count=30, top=20, ascending=False):
+    """Top tags for one nutrient, ignoring tags with fewer than `min_count` recipes."""
+    subset = stats[(stats["nutrient"] == nutrient) & (stats["count"] >= min_count)]
+    return subset.sort_values(by, ascending=ascending).head(top).reset_index(drop=True)
+
+
+def plot_ranked(ranked, nutrient, out_path, by="mean"):
+    """Horizontal bar chart of a rank_tags() result."""
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(8, max(4, 0.3 * len(ranked))))
+    plt.barh(ranked["tag"][::-1], ranked[by][::-1])
+    plt.title(f"Tags ranked by {by} {nutrient}")
+    plt.xlabel(nutrient)
+    plt.savefig(out_path, dpi=150, bbox_inches='tight')
+    plt.close()
+    return out_path
+
+
+# =========================
+# Command Line
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nutrition statistics for every Epicurious tag")
+    parser.add_argument("csv", nargs="?", help="Recipe CSV (default: download with kagglehub)")
+    parser.add_argument("--out", default="tag_stats.csv", help="Where to write the tidy table")
+    parser.add_argument("--rank", choices=NUTRITION_COLS, help="Print the top tags for this nutrient")
+    parser.add_argument("--by", default="mean", choices=RANK_BY, help="Column to rank by")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--min-count", type=int, default=30)
+    parser.add_argument("--plot", action="store_true", help="Also save a bar chart of the ranking (needs --rank)")
+    args = parser.parse_args(argv)
+    if args.plot and not args.rank:
+        parser.error("--plot needs --rank (which nutrient to rank the tags by)")
+
+    df = pd.read_csv(find_csv(args.csv))
+    stats = tag_nutrition_stats(df)
+    stats.to_csv(args.out, index=False)
+    print(f"Wrote {len(stats)} rows ({stats['tag'].nunique()} tags) to {args.out}")
+
+    if args.rank:
+        ranked = rank_tags(stats, args.rank, by=args.by, min_count=args.min_count, top=args.top)
+        print(ranked.to_string(index=False))
+        if args.plot:
+            out = plot_ranked(ranked, args.rank, f"tags_by_{args.by}_{args.rank}.png", by=args.by)
+            print(f"Saved {out}")
+
+
+if __name__ == "__main__":
+    main()
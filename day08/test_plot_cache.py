@@ -0,0 +1,64 @@
+# Tests for the figure cache in graphs.py / plot_cache.py: what gets redrawn when
+from pathlib import Path
+import sys
+
+import pandas as pd
+import pytest
+
+matplotlib = pytest.importorskip("matplotlib")
+pytest.importorskip("seaborn")
+matplotlib.use("Agg")
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+sys.path.insert(0, str(HERE.parent / "benchmarks"))
+import graphs
+from bench import make_recipe_csv
+
+FILES = ["graph_1_recipe_category_pie.png", "graph_2_protein_boxplot.png",
+         "graph_3_calories_boxplot.png", "graph_4_fat_boxplot.png"]
+
+
+@pytest.fixture
+def csv(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)             # PNGs and .plot_cache.json go to the cwd
+    return make_recipe_csv(str(tmp_path / "recipes.csv"), 300, n_tags=5)
+
+
+def redrawn(capsys, *args):
+    """Run graphs.py and return the graphs it drew (the others were up to date)."""
+    assert graphs.main(list(args)) == 0
+    out = capsys.readouterr().out
+    return [name for name in FILES if f"{name} is up to date" not in out]
+
+
+def test_second_run_skips_everything(csv, capsys):
+    assert redrawn(capsys, csv) == FILES
+    assert redrawn(capsys, csv) == []
+    assert redrawn(capsys, csv, "--force") == FILES
+
+
+def test_changed_data_redraws_only_its_graph(csv, capsys):
+    redrawn(capsys, csv)
+    df = pd.read_csv(csv, float_precision="round_trip")   # other columns stay identical
+    row = df.dropna(subset=["calories", "protein", "fat"]).index[0]
+    df.loc[row, "protein"] += 1
+    df.to_csv(csv, index=False)
+    assert redrawn(capsys, csv) == ["graph_2_protein_boxplot.png"]
+
+
+def test_changed_spec_redraws(csv, capsys, monkeypatch):
+    redrawn(capsys, csv)
+    monkeypatch.setitem(graphs.BOXPLOT_STYLE, "showfliers", False)
+    assert redrawn(capsys, csv) == FILES[1:]
+    monkeypatch.setitem(graphs.PIE_STYLE, "startangle", 90)
+    assert redrawn(capsys, csv) == FILES[:1]
+    monkeypatch.setitem(graphs.BOXPLOT_STYLE, "strip", {"color": "red", "alpha": 0.3, "jitter": True})
+    assert redrawn(capsys, csv) == FILES[1:]
+
+
+def test_missing_png_is_redrawn(csv, capsys, tmp_path):
+    redrawn(capsys, csv)
+    (tmp_path / FILES[2]).unlink()
+    assert redrawn(capsys, csv) == [FILES[2]]
+    assert (tmp_path / FILES[2]).exists()
@@ -0,0 +1,89 @@
+# Tests for recipe_search.py: every query is checked against plain pandas
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from recipe_search import RecipeIndex, main, pack_rows, unpack
+
+
+def make_recipes(n=1500, n_tags=90, seed=0):
+    rng = np.random.default_rng(seed)
+    tags = (rng.random((n, n_tags)) < rng.uniform(0.01, 0.2, n_tags)).astype(float)
+    df = pd.DataFrame(tags, columns=[f"tag{j}" for j in range(n_tags)])
+    df.insert(0, "title", [f"recipe {i}" for i in range(n)])
+    df.insert(1, "rating", rng.integers(0, 6, n).astype(float))
+    for col in ["calories", "protein", "fat", "sodium"]:
+        values = rng.lognormal(3, 1, n).round(1)    # rounded, so there are ties
+        values[rng.random(n) < 0.05] = np.nan
+        df[col] = values
+    return df
+
+
+@pytest.fixture(scope="module")
+def recipes():
+    df = make_recipes()
+    return df, RecipeIndex(df)
+
+
+def test_pack_and_unpack():
+    flags = np.random.default_rng(1).random((5, 130)) < 0.3
+    words = pack_rows(flags)
+    assert list(unpack(words[2], 130)) == list(np.flatnonzero(flags[2]))
+
+
+@pytest.mark.parametrize("low, high", [(None, None), (10, 40), (None, 5), (100, None),
+                                       (20.5, 20.5), (1e9, None), (30, 10)])
+def test_range_matches_pandas(recipes, low, high):
+    df, index = recipes
+    expected = df["protein"].notna()
+    if low is not None:
+        expected &= df["protein"] >= low
+    if high is not None:
+        expected &= df["protein"] <= high
+    got = unpack(index.range_bits("protein", low, high), index.n)
+    assert list(got) == list(np.flatnonzero(expected))
+
+
+def test_filter_matches_pandas(recipes):
+    df, index = recipes
+    got = index.filter(all_of=["tag3"], any_of=["tag7", "tag8"], none_of=["tag11"],
+                       ranges={"calories": (None, 60), "fat": (5, None)})
+    expected = ((df["tag3"] == 1) & ((df["tag7"] == 1) | (df["tag8"] == 1)) & (df["tag11"] == 0)
+                & (df["calories"] <= 60) & (df["fat"] >= 5))
+    assert list(got) == list(np.flatnonzero(expected))
+
+
+@pytest.mark.parametrize("target", [0, 17, 1499])
+def test_similar_matches_brute_force(recipes, target):
+    df, index = recipes
+    tags = df[index.tags].to_numpy(dtype=bool)
+    inter = (tags & tags[target]).sum(axis=1)
+    union = (tags | tags[target]).sum(axis=1)
+    score = np.where(union > 0, inter / np.maximum(union, 1), 0.0)
+    order = sorted((i for i in range(len(df)) if i != target and inter[i] > 0),
+                   key=lambda i: (-score[i], i))[:10]
+
+    got = index.similar(target, k=10)
+    assert [i for i, _ in got] == order
+    assert [s for _, s in got] == pytest.approx([score[i] for i in order])
+
+    within = index.filter_bits(any_of=["tag1", "tag2"])
+    allowed = set(index.filter(any_of=["tag1", "tag2"]))
+    got = index.similar(target, k=5, within=within)
+    assert [i for i, _ in got] == [i for i in sorted(allowed - {target}, key=lambda i: (-score[i], i))
+                                   if inter[i] > 0][:5]
+
+
+def test_cli_reports_bad_input(tmp_path, capsys):
+    csv = tmp_path / "recipes.csv"
+    make_recipes(50, 10).to_csv(csv, index=False)
+    for argv in (["--tags", "nope"], ["--range", "bogus=1:2"], ["--range", "protein=x:2"],
+                 ["--similar", "500"]):
+        with pytest.raises(SystemExit) as exc:
+            main([str(csv), *argv])
+        assert exc.value.code == 2
+        assert "error:" in capsys.readouterr().err
@@ -0,0 +1,112 @@
+# Tests for recipe_sketches.py: merged sketches against numpy on the full data
+from pathlib import Path
+import math
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from dataset import CATEGORIES
+from graphs import categorize_recipe
+from recipe_sketches import NutrientSketch, TDigest, categorize_chunk, sketch_csv
+
+
+def chunks(values, sizes):
+    start = 0
+    for size in sizes:
+        yield values[start:start + size]
+        start += size
+
+
+@pytest.fixture(scope="module")
+def lognormal():
+    return np.random.default_rng(0).lognormal(3, 1.2, 100_000)
+
+
+def test_moments_merge_exactly(lognormal):
+    values = lognormal[:10_007]
+    sizes = [1, 500, 3, 2500, 7003]
+
+    updated = NutrientSketch()
+    for part in chunks(values, sizes):
+        updated.update(part)
+
+    merged = NutrientSketch()
+    for part in chunks(values, sizes):
+        merged.merge(NutrientSketch().update(part))
+    merged.merge(NutrientSketch())          # merging an empty sketch changes nothing
+
+    for sketch in (updated, merged):
+        assert sketch.count == len(values)
+        assert sketch.mean == pytest.approx(values.mean(), rel=1e-12)
+        assert sketch.std == pytest.approx(values.std(ddof=1), rel=1e-10)
+        assert sketch.min == values.min()
+        assert sketch.max == values.max()
+
+
+def test_nan_is_ignored_and_empty_is_nan():
+    sketch = NutrientSketch().update([1.0, np.nan, 3.0])
+    assert sketch.count == 2
+    assert sketch.mean == 2.0
+    assert math.isnan(NutrientSketch().quantile(0.5))
+    assert math.isnan(NutrientSketch().std)
+
+
+@pytest.mark.parametrize("chunk", [1000, 100_000])
+def test_quantiles_are_accurate(lognormal, chunk):
+    digest = TDigest()
+    for part in chunks(lognormal, [chunk] * (len(lognormal) // chunk)):
+        digest.update(part)
+    assert digest.count == len(lognormal)
+    for q in (0.25, 0.5, 0.75):
+        assert digest.quantile(q) == pytest.approx(np.quantile(lognormal, q), rel=0.005)
+    for q in (0.01, 0.99, 0.999):
+        assert digest.quantile(q) == pytest.approx(np.quantile(lognormal, q), rel=0.02)
+    assert digest.quantile(0) == lognormal.min()
+    assert digest.quantile(1) == lognormal.max()
+
+
+def test_merged_digests_match_one_digest(lognormal):
+    halves = [TDigest().update(part) for part in chunks(lognormal, [30_000, 70_000])]
+    merged = halves[0].merge(halves[1])
+    for q in (0.25, 0.5, 0.75, 0.99):
+        assert merged.quantile(q) == pytest.approx(np.quantile(lognormal, q), rel=0.01)
+
+
+def test_boxplot_stats_only_has_min_and_max_as_fliers(lognormal):
+    stats = NutrientSketch().update(lognormal).boxplot_stats("Vegan")
+    assert stats["q1"] < stats["med"] < stats["q3"]
+    assert stats["whislo"] >= lognormal.min()
+    assert stats["fliers"] == [lognormal.max()]
+
+
+def test_sketch_csv_matches_pandas(tmp_path):
+    rng = np.random.default_rng(1)
+    n = 5000
+    df = pd.DataFrame({
+        "title": [f"r{i}" for i in range(n)],
+        "calories": rng.lognormal(6, 0.8, n),
+        "protein": rng.lognormal(2, 1, n),
+        "fat": rng.lognormal(2.5, 1, n),
+        "vegan": (rng.random(n) < 0.1).astype(float),
+        "vegetarian": (rng.random(n) < 0.3).astype(float),
+        "fish": (rng.random(n) < 0.2).astype(float),
+    })
+    df.loc[rng.random(n) < 0.1, "fat"] = np.nan
+    csv = tmp_path / "recipes.csv"
+    df.to_csv(csv, index=False)
+
+    sketches, actual_cols = sketch_csv(str(csv), chunksize=700)
+
+    clean = df.dropna(subset=["protein", "calories", "fat"])
+    category = clean.apply(categorize_recipe, axis=1)
+    assert list(categorize_chunk(clean)) == list(category)
+    for cat in CATEGORIES:
+        rows = clean[category == cat]
+        for key, col in actual_cols.items():
+            sketch = sketches[cat][key]
+            assert sketch.count == len(rows)
+            assert sketch.mean == pytest.approx(rows[col].mean(), rel=1e-9)
+            assert sketch.quantile(0.5) == pytest.approx(rows[col].median(), rel=0.02)
@@ -0,0 +1,53 @@
+# Tests for stage_profiler.py and the --profile report of graphs.py
+from pathlib import Path
+import json
+import sys
+
+import pandas as pd
+import pytest
+
+matplotlib = pytest.importorskip("matplotlib")
+pytest.importorskip("seaborn")
+matplotlib.use("Agg")
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+sys.path.insert(0, str(HERE.parent / "benchmarks"))
+import graphs
+from bench import make_recipe_csv
+from stage_profiler import StageProfiler
+
+
+def test_graphs_profile_report(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    csv = make_recipe_csv(str(tmp_path / "recipes.csv"), 300, n_tags=5)
+    report = str(tmp_path / "report.json")
+    assert graphs.main([csv, "--profile", report, "--force"]) == 0
+    assert "Profile (slowest first):" in capsys.readouterr().out
+
+    with open(report) as fh:
+        data = json.load(fh)
+    stages = [s["stage"] for s in data["stages"]]
+    assert stages[:6] == ["imports", "dataset_lookup", "csv_parse", "column_mapping", "dropna", "categorize"]
+    for n in range(1, 5):
+        assert stages.count(f"graph_{n}.hash") == stages.count(f"graph_{n}.draw") == 1
+        assert f"graph_{n}.savefig" in stages
+    assert all(s["seconds"] >= 0 for s in data["stages"])
+
+    frames = data["dataframes"]
+    assert list(frames) == ["loaded", "after_dropna", "categorized"]
+    assert frames["loaded"]["rows"] == 300
+    assert frames["loaded"]["rows"] >= frames["after_dropna"]["rows"] >= frames["categorized"]["rows"] > 0
+    assert frames["categorized"]["columns"] == frames["loaded"]["columns"] + 1   # + category
+    assert all(f["memory_bytes"] > 0 for f in frames.values())
+
+
+def test_disabled_profiler_records_nothing():
+    prof = StageProfiler(enabled=False)
+    ran = []
+    with prof.stage("work"):
+        ran.append(1)
+    prof.record_frame("df", pd.DataFrame({"a": [1, 2]}))
+    assert ran == [1]
+    assert prof.stages == [] and prof.frames == {}
+    assert prof.report()["stages"] == [] and prof.report()["dataframes"] == {}
@@ -0,0 +1,90 @@
+# Tests for tag_stats.py: the vectorized statistics against a pandas groupby per tag
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import tag_stats
+from tag_stats import main, rank_tags, tag_columns, tag_nutrition_stats
+
+
+def make_recipes(n=2000, n_tags=40, seed=0):
+    rng = np.random.default_rng(seed)
+    tags = (rng.random((n, n_tags)) < rng.uniform(0.002, 0.3, n_tags)).astype(float)
+    tags[rng.random((n, n_tags)) < 0.01] = np.nan          # some missing tag values
+    df = pd.DataFrame(tags, columns=[f"tag{j}" for j in range(n_tags)])
+    df["never"] = 0.0                                       # all-zero column: not a tag
+    df["rating"] = rng.integers(0, 6, n).astype(float)
+    for col in ["calories", "protein", "fat", "sodium"]:
+        values = rng.lognormal(3, 1, n).round(0)            # rounded, so there are ties
+        values[rng.random(n) < 0.1] = np.nan
+        df[col] = values
+    df["title"] = [f"recipe {i}" for i in range(n)]
+    return df
+
+
+@pytest.fixture(scope="module")
+def recipes():
+    df = make_recipes()
+    return df, tag_nutrition_stats(df)
+
+
+def test_tag_columns_skips_nutrition_rating_and_all_zero(recipes):
+    df, _ = recipes
+    assert tag_columns(df) == [f"tag{j}" for j in range(40)]
+
+
+def test_matches_pandas_groupby(recipes):
+    df, stats = recipes
+    for tag in tag_columns(df):
+        rows = df[df[tag] == 1]
+        for nutrient in ["calories", "protein", "fat", "sodium"]:
+            got = stats[(stats["tag"] == tag) & (stats["nutrient"] == nutrient)].iloc[0]
+            values = rows[nutrient].dropna()
+            assert got["count"] == len(values)
+            if len(values) == 0:
+                assert np.isnan(got["mean"]) and np.isnan(got["q50"])
+                continue
+            assert got["mean"] == pytest.approx(values.mean())
+            for col, q in (("q25", 0.25), ("q50", 0.5), ("q75", 0.75)):
+                assert got[col] == pytest.approx(values.quantile(q)), (tag, nutrient, col)
+
+
+def test_rank_tags(recipes):
+    _, stats = recipes
+    ranked = rank_tags(stats, "protein", by="q50", min_count=50, top=5)
+    assert len(ranked) == 5
+    assert (ranked["count"] >= 50).all()
+    assert ranked["q50"].is_monotonic_decreasing
+    subset = stats[(stats["nutrient"] == "protein") & (stats["count"] >= 50)]
+    assert ranked["q50"].iloc[0] == subset["q50"].max()
+
+
+def test_plot_needs_rank(tmp_path, capsys):
+    csv = tmp_path / "recipes.csv"
+    make_recipes(100, 5).to_csv(csv, index=False)
+    with pytest.raises(SystemExit) as exc:
+        main([str(csv), "--plot", "--out", str(tmp_path / "stats.csv")])
+    assert exc.value.code == 2
+    assert "--plot needs --rank" in capsys.readouterr().err
+
+
+def test_blocks_give_the_same_counts_and_means(recipes, monkeypatch):
+    df, stats = recipes
+    monkeypatch.setattr(tag_stats, "BLOCK_ROWS", 300)      # 2000 rows -> 7 blocks, the last one short
+    blocked = tag_nutrition_stats(df)
+    assert (blocked["count"] == stats["count"]).all()
+    np.testing.assert_allclose(blocked["mean"], stats["mean"], rtol=1e-12)
+
+
+def test_bad_by_is_rejected_before_loading(tmp_path, capsys):
+    out = tmp_path / "stats.csv"
+    for by in ("tag", "nutrient", "median"):
+        with pytest.raises(SystemExit) as exc:
+            main([str(tmp_path / "missing.csv"), "--rank", "protein", "--by", by, "--out", str(out)])
+        assert exc.value.code == 2
+        assert "--by" in capsys.readouterr().err
+    assert not out.exists()